@@ -7,26 +7,90 @@ using the es2abc compiler. Supports Windows and Linux platforms.
 """
 
 import asyncio
+import atexit
+import binascii
+import collections
+import functools
+import hashlib
+import itertools
 import json
 import os
 import platform
 import shutil
+import stat
 import subprocess
 import tempfile
-import uuid
+import threading
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
+
 # Initialize the MCP server
 mcp = FastMCP("es2abc_mcp")
 
 # Constants
 TEMP_DIR = tempfile.gettempdir()
+_PLATFORM = platform.system()
+_ARCH = platform.machine()
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_BATCH_SIZE = 64  # Max number of sources per batch compile
+COMPILE_TIMEOUT = 30  # Seconds before a running es2abc process is killed
+
+
+def _create_work_root() -> Path:
+    """Create the per-process working directory, preferring RAM-backed /dev/shm."""
+    base = TEMP_DIR
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        base = shm
+    work_root = Path(tempfile.mkdtemp(prefix="es2abc_mcp_", dir=base))
+    atexit.register(shutil.rmtree, work_root, ignore_errors=True)
+    return work_root
+
+
+# Long-lived working directory shared by all compilations in this process
+_WORK_ROOT = _create_work_root()
+# Temporary file names only need to be unique within the per-process work root
+_PID = os.getpid()
+_temp_counter = itertools.count()
+COMPILE_CACHE_SIZE = 256  # Max number of memoized compilation results
+DISK_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+
+
+def _user_cache_dir(name: str) -> Path:
+    """Per-user cache location: $XDG_CACHE_HOME, %LOCALAPPDATA% or ~/.cache."""
+    base = (os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return Path(base) / name
+
+
+# Persistent compile cache, survives server restarts; entries are returned as
+# compiler output, so it is kept per user rather than in the shared temp dir
+DISK_CACHE_DIR = Path(os.environ.get("ES2ABC_CACHE_DIR") or _user_cache_dir("es2abc_mcp"))
+# Running total of bytes in DISK_CACHE_DIR, computed lazily on first write
+_disk_cache_bytes: Optional[int] = None
+# Guards _disk_cache_bytes and eviction; cache writes run in worker threads
+_disk_cache_lock = threading.Lock()
+
+# Memoized compilation results: (source digest, compiler mtime) -> (abc_bytes, metadata).
+# abc_bytes is None when the result was produced without reading the payload.
+_compile_cache: "collections.OrderedDict[tuple, tuple[Optional[bytes], dict]]" = collections.OrderedDict()
+# Per-key [lock, callers] so concurrent identical requests share a single es2abc
+# run; an entry lives while any caller holds or waits on its lock
+_compile_locks: dict[tuple, list] = {}
+# Bounds the number of es2abc processes running at once across all requests
+_COMPILE_SEM = asyncio.Semaphore(os.cpu_count() or 4)
+# Cached compiler version: ((exe_path, exe_mtime), version_info)
+_version_cache: Optional[tuple[tuple[str, int], str]] = None
+_version_lock = asyncio.Lock()
 
 
 class ResponseFormat(str, Enum):
@@ -35,10 +99,14 @@ class ResponseFormat(str, Enum):
     JSON = "json"
 
 
+@functools.lru_cache(maxsize=1)
 def get_executable_path() -> str:
-    """Get the platform-specific es2abc executable path."""
-    system = platform.system().lower()
-    arch = platform.machine().lower()
+    """Get the platform-specific es2abc executable path.
+
+    The lookup is resolved once per process; call
+    `get_executable_path.cache_clear()` to pick up a new ES2ABC_PATH.
+    """
+    system = _PLATFORM.lower()
 
     # First, check if ES2ABC_PATH environment variable is set
     env_path = os.environ.get("ES2ABC_PATH")
@@ -73,7 +141,7 @@ class CompileInput(BaseModel):
     """Input model for JavaScript compilation operations."""
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True,
+        validate_assignment=False,
         extra='forbid'
     )
 
@@ -99,8 +167,9 @@ class CompileInput(BaseModel):
     def validate_js_code(cls, v: str) -> str:
         if not v or not v.strip():
             raise ValueError("JavaScript code cannot be empty")
-        # Check file size
-        if len(v.encode('utf-8')) > MAX_FILE_SIZE:
+        # Check file size; a UTF-8 character is at most 4 bytes, so only
+        # encode when the character count alone cannot rule out the limit
+        if len(v) * 4 > MAX_FILE_SIZE and len(v.encode('utf-8')) > MAX_FILE_SIZE:
             raise ValueError(f"JavaScript code exceeds maximum size of {MAX_FILE_SIZE} bytes")
         return v
 
@@ -109,7 +178,7 @@ class CompileFileInput(BaseModel):
     """Input model for compiling a JavaScript file by path."""
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True,
+        validate_assignment=False,
         extra='forbid'
     )
 
@@ -132,21 +201,67 @@ class CompileFileInput(BaseModel):
     @field_validator('file_path')
     @classmethod
     def validate_file_path(cls, v: str) -> str:
-        path = Path(v.strip())
-        if not path.exists():
+        path = v.strip()
+        # One stat call answers the existence, type and size checks
+        try:
+            st = os.stat(path)
+        except OSError:
             raise ValueError(f"File not found: {v}")
-        if not path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             raise ValueError(f"Path is not a file: {v}")
-        if not path.suffix.lower() == '.js':
+        if not os.path.splitext(path)[1].lower() == '.js':
             raise ValueError(f"File must have .js extension: {v}")
-        if path.stat().st_size > MAX_FILE_SIZE:
+        if st.st_size > MAX_FILE_SIZE:
             raise ValueError(f"File exceeds maximum size of {MAX_FILE_SIZE} bytes")
-        return str(path.resolve())
+        return os.path.realpath(path)
+
+
+class CompileBatchInput(BaseModel):
+    """Input model for compiling several JavaScript sources in one call."""
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=False,
+        extra='forbid'
+    )
+
+    sources: list[str] = Field(
+        ...,
+        description="List of JavaScript source code strings to compile independently (e.g., ['const a = 1;', 'function b() {}'])",
+        min_length=1,
+        max_length=MAX_BATCH_SIZE
+    )
+
+    output_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' for human-readable or 'json' for machine-readable"
+    )
+
+    return_binary: bool = Field(
+        default=False,
+        description="If true, include base64-encoded ABC binary data for each source (JSON format only)"
+    )
+
+    @field_validator('sources')
+    @classmethod
+    def validate_sources(cls, v: list[str]) -> list[str]:
+        for index, js_code in enumerate(v):
+            if not js_code or not js_code.strip():
+                raise ValueError(f"JavaScript code at index {index} cannot be empty")
+            if len(js_code) * 4 > MAX_FILE_SIZE and len(js_code.encode('utf-8')) > MAX_FILE_SIZE:
+                raise ValueError(f"JavaScript code at index {index} exceeds maximum size of {MAX_FILE_SIZE} bytes")
+        return v
 
 
 # Shared utility functions
 
 
+def _dumps(obj) -> str:
+    """Serialize obj as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2)
+
+
 def _handle_process_error(error: subprocess.CalledProcessError, context: str) -> str:
     """Consistent error formatting for process execution failures."""
     error_info = {
@@ -156,32 +271,297 @@ def _handle_process_error(error: subprocess.CalledProcessError, context: str) ->
         "stdout": error.stdout if error.stdout else "",
         "stderr": error.stderr if error.stderr else ""
     }
-    return json.dumps(error_info, indent=2)
+    return _dumps(error_info)
+
 
+def _compile_cache_key(source: Union[bytes, Path], exe_path: str) -> tuple:
+    """Build the memoization key for a source and compiler binary.
 
-async def _compile_js_to_abc(js_code: str, source_name: str = "input.js") -> tuple[bytes, dict]:
+    The source is either UTF-8 JavaScript code or the path of a staged
+    JavaScript file (see _stage_source), which is hashed in chunks without
+    being loaded whole. The compiler mtime is part of the key so that
+    replacing the es2abc binary invalidates previously cached results.
     """
-    Execute es2abc compiler to convert JavaScript to ABC bytecode.
+    if isinstance(source, Path):
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        digest = hasher.digest()
+    else:
+        digest = hashlib.blake2b(source, digest_size=16).digest()
+    try:
+        exe_mtime = os.stat(exe_path).st_mtime_ns
+    except OSError:
+        exe_mtime = 0
+    return digest, exe_mtime
+
+
+def _disk_cache_path(key: tuple) -> Path:
+    """Get the on-disk cache file for a memoization key."""
+    digest, exe_mtime = key
+    return DISK_CACHE_DIR / f"{digest.hex()}-{exe_mtime:x}.abc"
+
+
+def _ensure_private_dir(path: Path) -> bool:
+    """
+    Create path with mode 0o700 if missing; True if only this user can write to it.
+
+    A directory owned by someone else, or writable by group or others, is
+    refused so its contents are never trusted.
+    """
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o022):
+        return False
+    return True
+
+
+def _read_disk_cache(key: tuple, need_bytes: bool = True) -> Optional[tuple[bytes, int]]:
+    """
+    Look up a cached compilation result on disk.
+
+    Returns:
+        Tuple of (abc_bytes, output_size), or None on a miss. abc_bytes is
+        empty when need_bytes is False; only the file size is read then.
+    """
+    if not _ensure_private_dir(DISK_CACHE_DIR):
+        return None
+    path = _disk_cache_path(key)
+    try:
+        if need_bytes:
+            abc_bytes = path.read_bytes()
+            output_size = len(abc_bytes)
+        else:
+            abc_bytes = b""
+            output_size = path.stat().st_size
+        os.utime(path)  # Mark as recently used for eviction
+    except OSError:
+        return None
+    return abc_bytes, output_size
+
+
+def _write_disk_cache(key: tuple, source_path: Path) -> None:
+    """
+    Atomically store a compilation result on disk, evicting old entries if needed.
+
+    The result is copied from source_path without loading it into memory.
+    """
+    global _disk_cache_bytes
+
+    if not _ensure_private_dir(DISK_CACHE_DIR):
+        return  # The disk cache is an optimization only
+    path = _disk_cache_path(key)
+    tmp_path = None
+    try:
+        fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=DISK_CACHE_DIR)
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        shutil.copyfile(source_path, tmp_path)
+        size = tmp_path.stat().st_size
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+        return
+
+    with _disk_cache_lock:
+        if _disk_cache_bytes is None:
+            try:
+                _disk_cache_bytes = sum(entry.stat().st_size for entry in os.scandir(DISK_CACHE_DIR)
+                                        if entry.is_file())
+            except OSError:
+                return
+        else:
+            _disk_cache_bytes += size
+        if _disk_cache_bytes > DISK_CACHE_MAX_BYTES:
+            _evict_disk_cache()
+
+
+def _evict_disk_cache() -> None:
+    """
+    Remove least recently used cache files until the cache fits its size cap.
+
+    Called with _disk_cache_lock held.
+    """
+    global _disk_cache_bytes
+
+    try:
+        entries = [(entry.stat().st_mtime_ns, entry.stat().st_size, entry.path)
+                   for entry in os.scandir(DISK_CACHE_DIR) if entry.name.endswith('.abc')]
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= DISK_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            pass
+    _disk_cache_bytes = total
+
+
+def _stage_source(source: Path) -> Path:
+    """Copy a JavaScript file into the work root, so it cannot change between hash and compile."""
+    js_path = _WORK_ROOT / f"{_PID}_{next(_temp_counter)}.js"
+    try:
+        shutil.copyfile(source, js_path)
+    except BaseException:
+        js_path.unlink(missing_ok=True)
+        raise
+    return js_path
+
+
+def _remember(key: tuple, abc_bytes: Optional[bytes], metadata: dict) -> None:
+    """Store a compilation result in the in-process LRU cache."""
+    _compile_cache[key] = (abc_bytes, dict(metadata))
+    if len(_compile_cache) > COMPILE_CACHE_SIZE:
+        _compile_cache.popitem(last=False)
+
+
+async def _compile_js_to_abc(source: Union[str, Path], source_name: str = "input.js",
+                             need_bytes: bool = True) -> tuple[bytes, dict]:
+    """
+    Compile JavaScript to ABC bytecode, reusing memoized results when possible.
+
+    Results are keyed by source digest and compiler binary, and kept in a
+    bounded in-process LRU cache backed by a persistent on-disk cache. The
+    ABC output embeds the path of the staged source file, so it differs
+    byte for byte between compilations of the same source; a cached result
+    is the output of the first compilation. Concurrent requests for the same
+    source wait on a shared lock and reuse the first compilation.
 
     Args:
-        js_code: JavaScript source code
+        source: JavaScript source code, or the Path of a JavaScript file,
+            which is copied, hashed and compiled without being decoded
         source_name: Original filename for error reporting
+        need_bytes: Whether the caller needs the ABC payload; when False the
+            output is never read into memory and abc_bytes is empty
 
     Returns:
         Tuple of (abc_bytes, metadata_dict)
     """
     exe_path = get_executable_path()
+    staged = None
+    if isinstance(source, str):
+        # Encode inline code once; the cache key, staging and metadata reuse the bytes
+        source = source.encode('utf-8')
+    else:
+        # The copy is what gets hashed and compiled, so the key matches the output
+        source = staged = await asyncio.to_thread(_stage_source, source)
+    try:
+        key = await asyncio.to_thread(_compile_cache_key, source, exe_path)
+        return await _compile_with_key(source, exe_path, key, need_bytes)
+    finally:
+        if staged is not None:
+            staged.unlink(missing_ok=True)
+
+
+async def _compile_with_key(source: Union[bytes, Path], exe_path: str, key: tuple,
+                            need_bytes: bool) -> tuple[bytes, dict]:
+    """Serve a compilation from the caches or es2abc, one run per key at a time."""
+    entry = _compile_locks.get(key)
+    if entry is None:
+        entry = _compile_locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            cached = _compile_cache.get(key)
+            if cached is not None and (cached[0] is not None or not need_bytes):
+                _compile_cache.move_to_end(key)
+                abc_bytes, metadata = cached
+                metadata = dict(metadata)
+                metadata["cached"] = True
+                return abc_bytes if need_bytes else b"", metadata
+
+            disk_hit = await asyncio.to_thread(_read_disk_cache, key, need_bytes)
+            if disk_hit is not None:
+                abc_bytes, output_size = disk_hit
+                metadata = _build_metadata(_source_size(source), output_size)
+                _remember(key, abc_bytes if need_bytes else None, metadata)
+                metadata["cached"] = True
+                return abc_bytes, metadata
+
+            abc_bytes, metadata = await _run_es2abc(source, exe_path, key, need_bytes)
+
+            _remember(key, abc_bytes if need_bytes else None, metadata)
+            return abc_bytes, metadata
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _compile_locks[key]
+
+
+def _source_size(source: Union[bytes, Path]) -> int:
+    """Get the size in bytes of JavaScript code or a JavaScript file."""
+    if isinstance(source, Path):
+        return os.stat(source).st_size
+    return len(source)
+
+
+def _build_metadata(input_size: int, output_size: int) -> dict:
+    """Build the metadata dict describing a compilation result."""
+    return {
+        "input_size": input_size,
+        "output_size": output_size,
+        "compression_ratio": round(output_size / input_size, 2) if input_size else 0,
+        "compiler": "es2abc",
+        "platform": _PLATFORM
+    }
+
+
+async def _communicate(process: asyncio.subprocess.Process) -> tuple[bytes, bytes]:
+    """Wait for an es2abc process to finish, killing it after COMPILE_TIMEOUT seconds."""
+    try:
+        return await asyncio.wait_for(process.communicate(), timeout=COMPILE_TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise RuntimeError(f"es2abc compilation timed out after {COMPILE_TIMEOUT} seconds")
+
+
+async def _run_es2abc(source: Union[bytes, Path], exe_path: str, cache_key: Optional[tuple] = None,
+                      need_bytes: bool = True) -> tuple[bytes, dict]:
+    """
+    Execute es2abc compiler to convert JavaScript to ABC bytecode.
 
-    # Create temporary files for compilation
-    temp_dir = Path(TEMP_DIR) / f"es2abc_mcp_{uuid.uuid4().hex[:8]}"
-    temp_dir.mkdir(parents=True, exist_ok=True)
+    The source and output are staged through temporary files (the bundled
+    es2abc does not accept source on stdin). es2abc has no
+    daemon or REPL mode, so each call spawns one short-lived process;
+    repeated sources are served by the compile caches instead.
 
-    js_path = temp_dir / f"{uuid.uuid4().hex}.js"
-    abc_path = temp_dir / f"{uuid.uuid4().hex}.abc"
+    Args:
+        source: UTF-8 encoded JavaScript source, or the Path of a JavaScript
+            file, which is compiled in place and left for the caller to remove
+        exe_path: Path to the es2abc executable
+        cache_key: If given, store the output in the on-disk cache under this key
+        need_bytes: Whether to read the ABC payload; when False only its size
+            is taken and abc_bytes is empty
+
+    Returns:
+        Tuple of (abc_bytes, metadata_dict)
+    """
+    # Stage files in the shared working directory under counter-based names
+    stem = f"{_PID}_{next(_temp_counter)}"
+    js_path = _WORK_ROOT / f"{stem}.js"
+    abc_path = _WORK_ROOT / f"{stem}.abc"
 
     try:
-        # Write JavaScript source to temporary file
-        js_path.write_text(js_code, encoding='utf-8')
+        # Stage inline JavaScript source as a temporary file
+        if isinstance(source, Path):
+            js_path = source
+            input_size = os.stat(js_path).st_size
+        else:
+            js_path.write_bytes(source)
+            input_size = len(source)
 
         # Build command: es2abc --module input.js --output output.abc
         cmd = [
@@ -193,89 +573,168 @@ async def _compile_js_to_abc(js_code: str, source_name: str = "input.js") -> tup
         ]
 
         # Execute compiler
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=temp_dir
-        )
+        async with _COMPILE_SEM:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=_WORK_ROOT
+            )
 
-        stdout, stderr = await process.communicate()
+            stdout, stderr = await _communicate(process)
 
         if process.returncode != 0:
             error_output = stderr.decode('utf-8', errors='replace') or stdout.decode('utf-8', errors='replace')
             raise RuntimeError(f"es2abc compilation failed:\n{error_output}")
 
         # Read the compiled ABC file
-        if not abc_path.exists():
+        try:
+            output_size = abc_path.stat().st_size
+        except FileNotFoundError:
             raise RuntimeError("Compilation completed but output file not created")
 
-        abc_bytes = abc_path.read_bytes()
+        if cache_key is not None:
+            await asyncio.to_thread(_write_disk_cache, cache_key, abc_path)
 
-        metadata = {
-            "input_size": len(js_code.encode('utf-8')),
-            "output_size": len(abc_bytes),
-            "compression_ratio": round(len(abc_bytes) / len(js_code.encode('utf-8')), 2) if js_code else 0,
-            "compiler": "es2abc",
-            "platform": platform.system()
-        }
+        abc_bytes = abc_path.read_bytes() if need_bytes else b""
 
-        return abc_bytes, metadata
+        return abc_bytes, _build_metadata(input_size, output_size)
 
     finally:
         # Clean up temporary files
-        try:
-            if js_path.exists():
-                js_path.unlink()
-            if abc_path.exists():
-                abc_path.unlink()
-            if temp_dir.exists():
-                temp_dir.rmdir()
-        except Exception:
-            pass  # Best effort cleanup
+        for path in ((abc_path,) if isinstance(source, Path) else (js_path, abc_path)):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass  # Best effort cleanup
+
+
+# Markdown templates for single compilation results, filled from the metadata dict
+_MD_METADATA_TEMPLATE = (
+    "# ES2ABC Compilation Result\n"
+    "\n"
+    "## Metadata\n"
+    "- **Input Size**: {input_size:,} bytes\n"
+    "- **Output Size**: {output_size:,} bytes\n"
+    "- **Compression Ratio**: {compression_ratio:.2f}x\n"
+    "- **Compiler**: {compiler}\n"
+    "- **Platform**: {platform}\n"
+    "\n"
+)
+_MD_BINARY_TEMPLATE = _MD_METADATA_TEMPLATE + (
+    "## Binary Data\n"
+    "```\n{base64_preview}...\n```\n"
+    "*(Base64 encoded, {binary_size} bytes total)*"
+)
+_MD_OUTPUT_TEMPLATE = _MD_METADATA_TEMPLATE + (
+    "## Output\n"
+    "ABC bytecode generated successfully ({output_size:,} bytes).\n"
+    "Use `return_binary=true` to get the base64-encoded binary data."
+)
 
 
 def _format_compile_result(abc_bytes: bytes, metadata: dict, format: ResponseFormat,
                            return_binary: bool) -> str:
-    """Format compilation result based on requested format."""
+    """Format compilation result based on requested format.
+
+    The full base64 payload is only built for JSON output; markdown shows a
+    100-character preview, which needs just the first 75 bytes encoded.
+    """
     if return_binary:
-        import base64
-        metadata["base64_data"] = base64.b64encode(abc_bytes).decode('ascii')
         metadata["binary_size"] = len(abc_bytes)
+        if format == ResponseFormat.JSON:
+            metadata["base64_data"] = binascii.b2a_base64(abc_bytes, newline=False).decode('ascii')
+        else:
+            base64_preview = binascii.b2a_base64(abc_bytes[:75], newline=False).decode('ascii')
+
+    if format == ResponseFormat.JSON:
+        return _dumps(metadata)
+
+    # Markdown format
+    if return_binary:
+        return _MD_BINARY_TEMPLATE.format(base64_preview=base64_preview, **metadata)
+    return _MD_OUTPUT_TEMPLATE.format_map(metadata)
+
+
+def _format_batch_result(results: list[dict], format: ResponseFormat) -> str:
+    """Format batch compilation results based on requested format."""
+    succeeded = sum(1 for r in results if r["success"])
+    summary = {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results
+    }
 
     if format == ResponseFormat.JSON:
-        return json.dumps(metadata, indent=2)
+        return _dumps(summary)
 
     # Markdown format
     lines = [
-        "# ES2ABC Compilation Result",
+        "# ES2ABC Batch Compilation Result",
+        "",
+        f"**Total**: {summary['total']} | **Succeeded**: {summary['succeeded']} | **Failed**: {summary['failed']}",
         "",
-        "## Metadata",
-        f"- **Input Size**: {metadata['input_size']:,} bytes",
-        f"- **Output Size**: {metadata['output_size']:,} bytes",
-        f"- **Compression Ratio**: {metadata['compression_ratio']:.2f}x",
-        f"- **Compiler**: {metadata['compiler']}",
-        f"- **Platform**: {metadata['platform']}",
+        "| # | Status | Input Size | Output Size | Compression Ratio |",
+        "|---|--------|------------|-------------|-------------------|",
     ]
+    for r in results:
+        if r["success"]:
+            lines.append(
+                f"| {r['index']} | OK | {r['input_size']:,} bytes | {r['output_size']:,} bytes "
+                f"| {r['compression_ratio']:.2f}x |"
+            )
+        else:
+            lines.append(f"| {r['index']} | Failed | - | - | - |")
 
-    if return_binary:
-        lines.extend([
-            "",
-            "## Binary Data",
-            f"```\n{metadata['base64_data'][:100]}...\n```",
-            f"*(Base64 encoded, {metadata['binary_size']} bytes total)*"
-        ])
-    else:
-        lines.extend([
-            "",
-            "## Output",
-            f"ABC bytecode generated successfully ({metadata['output_size']:,} bytes).",
-            "Use `return_binary=true` to get the base64-encoded binary data."
-        ])
+    failures = [r for r in results if not r["success"]]
+    if failures:
+        lines.extend(["", "## Errors"])
+        for r in failures:
+            lines.append(f"### Source {r['index']}")
+            lines.append(f"```\n{r['error']}\n```")
 
     return "\n".join(lines)
 
 
+async def _get_version(exe_path: str) -> str:
+    """
+    Get the es2abc version string, running the compiler only once per binary.
+
+    The cached value is dropped when the executable path or mtime changes.
+    """
+    global _version_cache
+
+    try:
+        exe_mtime = os.stat(exe_path).st_mtime_ns
+    except OSError:
+        exe_mtime = 0
+    cache_key = (exe_path, exe_mtime)
+
+    async with _version_lock:
+        if _version_cache is not None and _version_cache[0] == cache_key:
+            return _version_cache[1]
+
+        # Try to get version by running the compiler
+        version_info = "unknown"
+        try:
+            process = await asyncio.create_subprocess_exec(
+                exe_path,
+                "--version",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+            version_output = (stdout or stderr).decode('utf-8', errors='replace').strip()
+            if version_output:
+                version_info = version_output.split('\n')[0]
+        except Exception:
+            pass  # Version detection not critical
+
+        _version_cache = (cache_key, version_info)
+        return version_info
+
+
 # Tool definitions
 
 
@@ -322,6 +781,7 @@ async def es2abc_compile(params: CompileInput) -> str:
         - Returns "Error: JavaScript code cannot be empty" if input is empty
         - Returns "Error: File exceeds maximum size" if input is too large
         - Returns compilation errors from es2abc if JavaScript has syntax errors
+        - Returns "Error: es2abc compilation timed out" if es2abc runs longer than 30 seconds
 
     Platform Support:
         - Windows: Uses es2abc.exe from bin/ directory or ES2ABC_PATH environment variable
@@ -329,7 +789,8 @@ async def es2abc_compile(params: CompileInput) -> str:
         - macOS: Uses es2abc from bin/ directory or ES2ABC_PATH environment variable
     """
     try:
-        abc_bytes, metadata = await _compile_js_to_abc(params.js_code, "inline.js")
+        abc_bytes, metadata = await _compile_js_to_abc(params.js_code, "inline.js",
+                                                       need_bytes=params.return_binary)
         metadata["success"] = True
         return _format_compile_result(abc_bytes, metadata, params.output_format, params.return_binary)
 
@@ -389,11 +850,11 @@ async def es2abc_compile_file(params: CompileFileInput) -> str:
         - macOS: Supports paths like "/Users/user/file.js"
     """
     try:
-        # Read the JavaScript file
+        # The file is handed to es2abc as-is, without decoding it in Python
         file_path = Path(params.file_path)
-        js_code = file_path.read_text(encoding='utf-8')
 
-        abc_bytes, metadata = await _compile_js_to_abc(js_code, file_path.name)
+        abc_bytes, metadata = await _compile_js_to_abc(file_path, file_path.name,
+                                                       need_bytes=params.return_binary)
         metadata["source_file"] = str(file_path)
         metadata["success"] = True
 
@@ -407,6 +868,77 @@ async def es2abc_compile_file(params: CompileFileInput) -> str:
         return f"Error: Unexpected error during compilation: {type(e).__name__}: {str(e)}"
 
 
+@mcp.tool(
+    name="es2abc_compile_batch",
+    annotations={
+        "title": "Compile Multiple JavaScript Sources to ABC Bytecode",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False
+    }
+)
+async def es2abc_compile_batch(params: CompileBatchInput) -> str:
+    """Compile several JavaScript sources to ABC bytecode in parallel.
+
+    Each source is compiled independently by its own es2abc process. Up to
+    one process per CPU core runs at a time (shared with other in-flight
+    compile requests), so a batch finishes much faster than the same number
+    of sequential es2abc_compile calls.
+
+    Args:
+        params (CompileBatchInput): Validated input parameters containing:
+            - sources (list[str]): JavaScript source code strings to compile
+            - output_format (Optional[ResponseFormat]): Response format (markdown/json)
+            - return_binary (Optional[bool]): Include base64-encoded binary data (JSON only)
+
+    Returns:
+        str: Formatted batch result containing:
+            - total/succeeded/failed: Batch summary counts
+            - results: Per-source metadata in input order, with "index",
+              "success" and either size information or an "error" message
+
+    Examples:
+        - Use when: "Compile these three JavaScript snippets to ABC"
+        - Don't use when: You only have a single snippet (use es2abc_compile instead)
+        - Don't use when: You need to compile from a file (use es2abc_compile_file instead)
+
+    Error Handling:
+        - Returns "Error: JavaScript code at index N cannot be empty" if any source is empty
+        - A compilation error in one source is reported in its result entry
+          and does not fail the rest of the batch
+    """
+    need_bytes = params.return_binary and params.output_format == ResponseFormat.JSON
+
+    async def compile_one(index: int, js_code: str) -> dict:
+        try:
+            abc_bytes, metadata = await _compile_js_to_abc(js_code, f"batch_{index}.js",
+                                                           need_bytes=need_bytes)
+        except RuntimeError as e:
+            return {"index": index, "success": False, "error": str(e)}
+        except Exception as e:
+            return {
+                "index": index,
+                "success": False,
+                "error": f"Unexpected error during compilation: {type(e).__name__}: {str(e)}"
+            }
+
+        result = {"index": index, "success": True, **metadata}
+        if need_bytes:
+            result["base64_data"] = binascii.b2a_base64(abc_bytes, newline=False).decode('ascii')
+            result["binary_size"] = len(abc_bytes)
+        return result
+
+    try:
+        results = await asyncio.gather(
+            *(compile_one(index, js_code) for index, js_code in enumerate(params.sources))
+        )
+        return _format_batch_result(list(results), params.output_format)
+
+    except Exception as e:
+        return f"Error: Unexpected error during batch compilation: {type(e).__name__}: {str(e)}"
+
+
 @mcp.tool(
     name="es2abc_get_status",
     annotations={
@@ -443,43 +975,29 @@ async def es2abc_get_status() -> str:
     try:
         exe_path = get_executable_path()
 
-        # Try to get version by running the compiler
-        version_info = "unknown"
-        try:
-            process = await asyncio.create_subprocess_exec(
-                exe_path,
-                "--version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            version_output = (stdout or stderr).decode('utf-8', errors='replace').strip()
-            if version_output:
-                version_info = version_output.split('\n')[0]
-        except Exception:
-            pass  # Version detection not critical
+        version_info = await _get_version(exe_path)
 
         status = {
             "available": True,
             "executable_path": exe_path,
-            "platform": platform.system(),
-            "architecture": platform.machine(),
+            "platform": _PLATFORM,
+            "architecture": _ARCH,
             "version": version_info,
             "max_file_size": MAX_FILE_SIZE,
-            "temp_directory": TEMP_DIR
+            "temp_directory": str(_WORK_ROOT)
         }
 
-        return json.dumps(status, indent=2)
+        return _dumps(status)
 
     except RuntimeError as e:
         status = {
             "available": False,
             "error": str(e),
-            "platform": platform.system(),
-            "architecture": platform.machine(),
+            "platform": _PLATFORM,
+            "architecture": _ARCH,
             "suggestion": "Set ES2ABC_PATH environment variable to the es2abc executable"
         }
-        return json.dumps(status, indent=2)
+        return _dumps(status)
 
 
 if __name__ == "__main__":
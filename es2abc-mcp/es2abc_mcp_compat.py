@@ -7,17 +7,29 @@ Compatible with older Python versions (3.8+).
 """
 
 import asyncio
-import base64
+import atexit
+import functools
+import itertools
 import json
 import os
 import platform
+import select
 import shutil
 import subprocess
 import sys
 import tempfile
-import uuid
 from pathlib import Path
 
+try:
+    from pybase64 import b64encode
+except ImportError:  # Optional speedup, see the "speedups" extra
+    from base64 import b64encode
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
+
 # Server info
 SERVER_NAME = "es2abc_mcp"
 SERVER_VERSION = "1.0.0"
@@ -25,10 +37,25 @@ SERVER_VERSION = "1.0.0"
 # Constants
 TEMP_DIR = tempfile.gettempdir()
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+# Longest request line accepted; JSON escaping can turn one byte into six characters
+READ_LIMIT = 6 * MAX_FILE_SIZE + 64 * 1024
+
+# Process-private work directory reused by every compilation
+_WORK_DIR = Path(tempfile.mkdtemp(prefix="es2abc_mcp_", dir=TEMP_DIR))
+atexit.register(shutil.rmtree, _WORK_DIR, ignore_errors=True)
+# Sequence for staged file names; the work directory is private to this process
+_SEQ = itertools.count()
 
+# In-flight compilations keyed by (executable, source), shared by concurrent callers
+_inflight = {}
 
+
+@functools.lru_cache(maxsize=1)
 def get_executable_path():
-    """Get the platform-specific es2abc executable path."""
+    """Get the platform-specific es2abc executable path.
+
+    The lookup is resolved once per process; see invalidate_exe_cache().
+    """
     system = platform.system().lower()
 
     # Check environment variable
@@ -54,20 +81,65 @@ def get_executable_path():
     raise RuntimeError(f"es2abc executable not found. Expected at: {exe_path}")
 
 
-async def compile_js_to_abc(js_code, source_name="input.js"):
-    """Compile JavaScript to ABC bytecode."""
+def invalidate_exe_cache():
+    """Forget the resolved es2abc path, e.g. after ES2ABC_PATH changes."""
+    get_executable_path.cache_clear()
+
+
+def build_metadata(input_size, abc_bytes):
+    """Build the compilation metadata dictionary."""
+    return {
+        "success": True,
+        "input_size": input_size,
+        "output_size": len(abc_bytes),
+        "compression_ratio": round(len(abc_bytes) / input_size, 2) if input_size else 0,
+        "compiler": "es2abc",
+        "platform": platform.system()
+    }
+
+
+async def compile_js_to_abc(source, source_name="input.js"):
+    """Compile JavaScript to ABC bytecode.
+
+    `source` is either UTF-8 encoded bytes or the Path of a .js file, which
+    es2abc then reads itself. Concurrent requests for the same source share
+    a single es2abc run.
+    """
     exe_path = get_executable_path()
+    key = (exe_path, source)
+
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(run_es2abc(source, exe_path))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    abc_bytes, metadata = await asyncio.shield(future)
+    return abc_bytes, dict(metadata)
 
-    # Create temp directory
-    temp_dir = Path(TEMP_DIR) / f"es2abc_mcp_{uuid.uuid4().hex[:8]}"
-    temp_dir.mkdir(parents=True, exist_ok=True)
 
-    js_path = temp_dir / f"{uuid.uuid4().hex}.js"
-    abc_path = temp_dir / f"{uuid.uuid4().hex}.abc"
+async def run_es2abc(source, exe_path):
+    """Run es2abc once for the given source.
+
+    Source is staged in temporary files (the bundled es2abc does not
+    accept source on stdin). es2abc has no daemon or multi-job mode, so
+    every compilation is a fresh process.
+    """
+    seq = next(_SEQ)
+    js_path = _WORK_DIR / f"{seq}.js"
+    abc_path = _WORK_DIR / f"{seq}.abc"
 
     try:
-        # Write JS file
-        js_path.write_text(js_code, encoding='utf-8')
+        # Stage JS file; files are linked (or copied in-kernel) rather than read
+        if isinstance(source, Path):
+            try:
+                os.link(source, js_path)
+            except OSError:
+                shutil.copyfile(source, js_path)
+            input_size = js_path.stat().st_size
+        else:
+            js_path.write_bytes(source)
+            input_size = len(source)
 
         # Build command
         cmd = [exe_path, "--module", str(js_path), "--output", str(abc_path)]
@@ -77,7 +149,7 @@ async def compile_js_to_abc(js_code, source_name="input.js"):
             *cmd,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
-            cwd=temp_dir
+            cwd=_WORK_DIR
         )
 
         stdout, stderr = await process.communicate()
@@ -92,30 +164,62 @@ async def compile_js_to_abc(js_code, source_name="input.js"):
 
         abc_bytes = abc_path.read_bytes()
 
-        metadata = {
-            "success": True,
-            "input_size": len(js_code.encode('utf-8')),
-            "output_size": len(abc_bytes),
-            "compression_ratio": round(len(abc_bytes) / len(js_code.encode('utf-8')), 2) if js_code else 0,
-            "compiler": "es2abc",
-            "platform": platform.system()
-        }
-
-        return abc_bytes, metadata
+        return abc_bytes, build_metadata(input_size, abc_bytes)
 
     finally:
         # Cleanup
-        for p in [js_path, abc_path, temp_dir]:
+        for p in [js_path, abc_path]:
             try:
-                if p.exists():
-                    if p.is_dir():
-                        p.rmdir()
-                    else:
-                        p.unlink()
-            except:
+                p.unlink()
+            except OSError:
                 pass
 
 
+# Markdown result layouts, assembled once and filled with a single format call
+MD_HEADER = "# ES2ABC Compilation Result\n\n## Metadata\n"
+MD_SOURCE_FILE = "- **Source File**: {source_file}\n"
+MD_METADATA = (
+    "- **Input Size**: {input_size:,} bytes\n"
+    "- **Output Size**: {output_size:,} bytes\n"
+    "- **Compression Ratio**: {compression_ratio:.2f}x\n"
+    "- **Compiler**: {compiler}\n"
+    "- **Platform**: {platform}"
+)
+MD_BINARY = (
+    "\n\n## Binary Data\n"
+    "```\n{base64_preview}...\n```\n"
+    "*(Base64 encoded, {output_size} bytes total)*"
+)
+MD_OUTPUT = (
+    "\n\n## Output\n"
+    "ABC bytecode generated successfully ({output_size:,} bytes).\n"
+    "Use `return_binary=true` to get the base64-encoded binary data."
+)
+MD_COMPILE_BINARY_TEMPLATE = MD_HEADER + MD_METADATA + MD_BINARY
+MD_COMPILE_OUTPUT_TEMPLATE = MD_HEADER + MD_METADATA + MD_OUTPUT
+MD_FILE_TEMPLATE = MD_HEADER + MD_SOURCE_FILE + MD_METADATA
+MD_FILE_BINARY_TEMPLATE = MD_FILE_TEMPLATE + MD_BINARY
+
+
+def dumps(obj):
+    """Serialize a tool result as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2)
+
+
+def dumps_message(obj):
+    """Serialize a JSON-RPC message to compact UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def base64_preview(abc_bytes, length=100):
+    """Base64-encode only the bytes needed for a preview of `length` characters."""
+    return b64encode(abc_bytes[:length // 4 * 3]).decode('ascii')
+
+
 # Tool handlers
 async def handle_es2abc_compile(params):
     """Handle es2abc_compile tool call."""
@@ -127,46 +231,24 @@ async def handle_es2abc_compile(params):
     if not js_code or not js_code.strip():
         return "Error: JavaScript code cannot be empty"
 
-    if len(js_code.encode('utf-8')) > MAX_FILE_SIZE:
+    js_bytes = js_code.encode('utf-8')
+    if len(js_bytes) > MAX_FILE_SIZE:
         return f"Error: JavaScript code exceeds maximum size of {MAX_FILE_SIZE} bytes"
 
     try:
-        abc_bytes, metadata = await compile_js_to_abc(js_code, "inline.js")
-
-        if return_binary:
-            metadata["base64_data"] = base64.b64encode(abc_bytes).decode('ascii')
+        abc_bytes, metadata = await compile_js_to_abc(js_bytes, "inline.js")
 
         if output_format == "json":
-            return json.dumps(metadata, indent=2)
+            if return_binary:
+                metadata["base64_data"] = b64encode(abc_bytes).decode('ascii')
+                del abc_bytes  # Only the encoded copy is serialized
+            return dumps(metadata)
 
         # Markdown format
-        lines = [
-            "# ES2ABC Compilation Result",
-            "",
-            "## Metadata",
-            f"- **Input Size**: {metadata['input_size']:,} bytes",
-            f"- **Output Size**: {metadata['output_size']:,} bytes",
-            f"- **Compression Ratio**: {metadata['compression_ratio']:.2f}x",
-            f"- **Compiler**: {metadata['compiler']}",
-            f"- **Platform**: {metadata['platform']}",
-        ]
-
         if return_binary:
-            lines.extend([
-                "",
-                "## Binary Data",
-                f"```\n{metadata['base64_data'][:100]}...\n```",
-                f"*(Base64 encoded, {metadata['output_size']} bytes total)*"
-            ])
-        else:
-            lines.extend([
-                "",
-                "## Output",
-                f"ABC bytecode generated successfully ({metadata['output_size']:,} bytes).",
-                "Use `return_binary=true` to get the base64-encoded binary data."
-            ])
-
-        return "\n".join(lines)
+            return MD_COMPILE_BINARY_TEMPLATE.format(
+                base64_preview=base64_preview(abc_bytes), **metadata)
+        return MD_COMPILE_OUTPUT_TEMPLATE.format_map(metadata)
 
     except Exception as e:
         return f"Error: {str(e)}"
@@ -193,38 +275,21 @@ async def handle_es2abc_compile_file(params):
         return f"Error: File exceeds maximum size of {MAX_FILE_SIZE} bytes"
 
     try:
-        js_code = path.read_text(encoding='utf-8')
-        abc_bytes, metadata = await compile_js_to_abc(js_code, path.name)
-        metadata["source_file"] = str(path.resolve())
-
-        if return_binary:
-            metadata["base64_data"] = base64.b64encode(abc_bytes).decode('ascii')
+        source_file = path.resolve()
+        abc_bytes, metadata = await compile_js_to_abc(source_file, path.name)
+        metadata["source_file"] = str(source_file)
 
         if output_format == "json":
-            return json.dumps(metadata, indent=2)
+            if return_binary:
+                metadata["base64_data"] = b64encode(abc_bytes).decode('ascii')
+                del abc_bytes  # Only the encoded copy is serialized
+            return dumps(metadata)
 
         # Markdown format
-        lines = [
-            "# ES2ABC Compilation Result",
-            "",
-            "## Metadata",
-            f"- **Source File**: {metadata['source_file']}",
-            f"- **Input Size**: {metadata['input_size']:,} bytes",
-            f"- **Output Size**: {metadata['output_size']:,} bytes",
-            f"- **Compression Ratio**: {metadata['compression_ratio']:.2f}x",
-            f"- **Compiler**: {metadata['compiler']}",
-            f"- **Platform**: {metadata['platform']}",
-        ]
-
         if return_binary:
-            lines.extend([
-                "",
-                "## Binary Data",
-                f"```\n{metadata['base64_data'][:100]}...\n```",
-                f"*(Base64 encoded, {metadata['output_size']} bytes total)*"
-            ])
-
-        return "\n".join(lines)
+            return MD_FILE_BINARY_TEMPLATE.format(
+                base64_preview=base64_preview(abc_bytes), **metadata)
+        return MD_FILE_TEMPLATE.format_map(metadata)
 
     except Exception as e:
         return f"Error: {str(e)}"
@@ -233,6 +298,7 @@ async def handle_es2abc_compile_file(params):
 async def handle_es2abc_get_status(params):
     """Handle es2abc_get_status tool call."""
     try:
+        invalidate_exe_cache()  # Report the current configuration
         exe_path = get_executable_path()
 
         status = {
@@ -241,10 +307,10 @@ async def handle_es2abc_get_status(params):
             "platform": platform.system(),
             "architecture": platform.machine(),
             "max_file_size": MAX_FILE_SIZE,
-            "temp_directory": TEMP_DIR
+            "temp_directory": str(_WORK_DIR)
         }
 
-        return json.dumps(status, indent=2)
+        return dumps(status)
 
     except RuntimeError as e:
         status = {
@@ -254,7 +320,20 @@ async def handle_es2abc_get_status(params):
             "architecture": platform.machine(),
             "suggestion": "Set ES2ABC_PATH environment variable to the es2abc executable"
         }
-        return json.dumps(status, indent=2)
+        return dumps(status)
+
+
+def write_all(fd, data):
+    """Write data to a file descriptor, retrying partial and would-block writes."""
+    view = memoryview(data)
+    while view:
+        try:
+            written = os.write(fd, view)
+        except BlockingIOError:
+            # stdout shares a non-blocking tty with the loop-attached stdin
+            select.select([], [fd], [])
+            continue
+        view = view[written:]
 
 
 # Main MCP protocol handler
@@ -325,6 +404,21 @@ class MCPServer:
             "es2abc_get_status": handle_es2abc_get_status
         }
 
+        # Static results, built once and shared by every response
+        self.initialize_result = {
+            "protocolVersion": "2024-11-05",
+            "serverInfo": {
+                "name": SERVER_NAME,
+                "version": SERVER_VERSION
+            },
+            "capabilities": {
+                "tools": {}
+            }
+        }
+        self.tools_list_result = {
+            "tools": list(self.tools.values())
+        }
+
     async def handle_request(self, request):
         """Handle an MCP request."""
         method = request.get("method")
@@ -333,25 +427,14 @@ class MCPServer:
             return {
                 "jsonrpc": "2.0",
                 "id": request.get("id"),
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "serverInfo": {
-                        "name": SERVER_NAME,
-                        "version": SERVER_VERSION
-                    },
-                    "capabilities": {
-                        "tools": {}
-                    }
-                }
+                "result": self.initialize_result
             }
 
         elif method == "tools/list":
             return {
                 "jsonrpc": "2.0",
                 "id": request.get("id"),
-                "result": {
-                    "tools": list(self.tools.values())
-                }
+                "result": self.tools_list_result
             }
 
         elif method == "tools/call":
@@ -403,31 +486,92 @@ class MCPServer:
                 }
             }
 
+    async def open_stdin(self):
+        """Attach stdin to the event loop.
+
+        Returns (read_line, read_exactly) coroutine functions yielding bytes.
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=READ_LIMIT)
+        try:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        except (NotImplementedError, ValueError, OSError):
+            # Windows consoles and regular files cannot be attached; read in a thread
+            stdin = sys.stdin.buffer
+            return (lambda: loop.run_in_executor(None, stdin.readline),
+                    lambda n: loop.run_in_executor(None, stdin.read, n))
+        return reader.readline, reader.readexactly
+
+    async def read_message(self, read_line, read_exactly):
+        """Read one message body and whether it used Content-Length framing.
+
+        Newline-delimited JSON is MCP's stdio transport; LSP-style
+        `Content-Length` framing is accepted too and read in one call.
+        Returns (b"", False) at end of input.
+        """
+        line = await read_line()
+        if line[:15].lower() != b"content-length:":
+            return line, False
+
+        length = int(line[15:])
+        # Skip any further headers up to the blank separator line
+        while (await read_line()).strip():
+            pass
+        return await read_exactly(length), True
+
+    async def write_response(self, response, framed=False):
+        """Write one response to stdout with a single unbuffered write."""
+        payload = dumps_message(response)
+        if framed:
+            payload = b"Content-Length: %d\r\n\r\n" % len(payload) + payload
+        else:
+            payload += b"\n"
+        loop = asyncio.get_running_loop()
+        async with self._write_lock:
+            await loop.run_in_executor(None, write_all, sys.stdout.fileno(), payload)
+
+    async def process_request(self, request, framed=False):
+        """Handle a request and write its response in the same framing."""
+        try:
+            response = await self.handle_request(request)
+            await self.write_response(response, framed)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+
     async def run(self):
-        """Run the MCP server using stdio."""
+        """Run the MCP server using stdio.
+
+        Requests are read without blocking the event loop and handled
+        concurrently, so slow compilations do not hold up other calls.
+        """
         print(f"Starting {SERVER_NAME} v{SERVER_VERSION}", file=sys.stderr)
 
+        self._write_lock = asyncio.Lock()
+        read_line, read_exactly = await self.open_stdin()
+        pending = set()
+
         while True:
             try:
                 # Read request from stdin
-                line = sys.stdin.readline()
-                if not line:
+                body, framed = await self.read_message(read_line, read_exactly)
+                if not body:
                     break
 
-                request = json.loads(line)
+                request = json.loads(body)
 
-                # Handle request
-                response = await self.handle_request(request)
-
-                # Write response to stdout
-                print(json.dumps(response))
-                sys.stdout.flush()
+                # Handle request in the background
+                task = asyncio.ensure_future(self.process_request(request, framed))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
 
             except json.JSONDecodeError:
                 print(f"Error: Invalid JSON", file=sys.stderr)
             except Exception as e:
                 print(f"Error: {e}", file=sys.stderr)
 
+        if pending:
+            await asyncio.gather(*pending)
+
 
 if __name__ == "__main__":
     server = MCPServer()
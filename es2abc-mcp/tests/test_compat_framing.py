@@ -0,0 +1,91 @@
+"""Tests for the compat server's Content-Length and line-delimited stdio framing."""
+
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import es2abc_mcp_compat as compat
+
+SERVER = os.path.join(os.path.dirname(__file__), "..", "es2abc_mcp_compat.py")
+
+
+def _request(request_id, method):
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method}).encode()
+
+
+def _framed(body, headers=b""):
+    return b"Content-Length: %d\r\n%s\r\n" % (len(body), headers) + body
+
+
+def _read_messages(stream):
+    """Split server output into (framed, message) pairs."""
+    messages = []
+    reader = io.BytesIO(stream)
+    while True:
+        line = reader.readline()
+        if not line:
+            return messages
+        if line.lower().startswith(b"content-length:"):
+            length = int(line[15:])
+            assert reader.readline() == b"\r\n"
+            messages.append((True, json.loads(reader.read(length))))
+        else:
+            messages.append((False, json.loads(line)))
+
+
+def _read_all(data):
+    """Run read_message over data until end of input."""
+    server = compat.MCPServer()
+    stream = io.BytesIO(data)
+
+    async def read_line():
+        return stream.readline()
+
+    async def read_exactly(n):
+        return stream.read(n)
+
+    async def read():
+        messages = []
+        while True:
+            body, framed = await server.read_message(read_line, read_exactly)
+            if not body:
+                return messages
+            messages.append((framed, json.loads(body)))
+
+    return asyncio.run(read())
+
+
+def test_read_message_framings():
+    body = _request(2, "tools/list")
+    data = (
+        _request(1, "initialize") + b"\n"
+        + _framed(body)
+        + _framed(_request(3, "initialize"), b"Content-Type: application/json\r\n").lower()
+        + _framed(b'{"id": 4,\n "method": "tools/list"}')
+    )
+    messages = _read_all(data)
+    assert [(framed, m["id"]) for framed, m in messages] == [
+        (False, 1), (True, 2), (True, 3), (True, 4)
+    ]
+
+
+def test_server_answers_in_request_framing():
+    data = (
+        _framed(_request(1, "initialize"))
+        + _request(2, "tools/list") + b"\n"
+        + _framed(_request(3, "tools/list"))
+    )
+    proc = subprocess.run(
+        [sys.executable, SERVER], input=data, capture_output=True, timeout=30
+    )
+    assert proc.returncode == 0, proc.stderr
+    responses = {m["id"]: (framed, m) for framed, m in _read_messages(proc.stdout)}
+    assert sorted(responses) == [1, 2, 3]
+    assert responses[1][0] and not responses[2][0] and responses[3][0]
+    assert responses[1][1]["result"]["serverInfo"]["name"] == compat.SERVER_NAME
+    assert len(responses[2][1]["result"]["tools"]) == 3
@@ -0,0 +1,78 @@
+"""Tests for the per-key compile locks and caches of the FastMCP server."""
+
+import asyncio
+import collections
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import es2abc_mcp
+
+
+@pytest.fixture
+def runs(tmp_path, monkeypatch):
+    """Replace es2abc with a fake; returns the sources it was run on."""
+    calls = []
+
+    async def fake_run_es2abc(source, exe_path, cache_key=None, need_bytes=True):
+        if isinstance(source, os.PathLike):
+            source = open(source, "rb").read()
+        calls.append(source)
+        await asyncio.sleep(0.01)
+        if source.startswith(b"fail"):
+            raise RuntimeError("es2abc compilation failed")
+        abc_bytes = b"ABC" + source
+        return abc_bytes, es2abc_mcp._build_metadata(len(source), len(abc_bytes))
+
+    monkeypatch.setattr(es2abc_mcp, "get_executable_path", lambda: "es2abc")
+    monkeypatch.setattr(es2abc_mcp, "_run_es2abc", fake_run_es2abc)
+    monkeypatch.setattr(es2abc_mcp, "DISK_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(es2abc_mcp, "_compile_cache", collections.OrderedDict())
+    return calls
+
+
+async def _compile_all(sources):
+    return await asyncio.gather(
+        *(es2abc_mcp._compile_js_to_abc(source) for source in sources),
+        return_exceptions=True,
+    )
+
+
+def test_lock_map_empty_after_concurrent_compiles(runs):
+    sources = ["const a = 1;"] * 5 + ["const b = 2;"] * 3 + ["fail 1;"] * 3
+    results = asyncio.run(_compile_all(sources))
+
+    assert es2abc_mcp._compile_locks == {}
+    assert [r[0] for r in results[:8]] == [b"ABC" + s.encode() for s in sources[:8]]
+    assert all(isinstance(r, RuntimeError) for r in results[8:])
+    # Identical sources share one run; failures are not cached, so each waiter retries
+    assert sorted(runs) == sorted([b"const a = 1;", b"const b = 2;"] + [b"fail 1;"] * 3)
+
+
+def test_lock_map_empty_after_cancelled_compile(runs):
+    async def cancel_one():
+        task = asyncio.ensure_future(es2abc_mcp._compile_js_to_abc("const c = 3;"))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(es2abc_mcp._compile_js_to_abc("const c = 3;"))
+        await asyncio.sleep(0.001)
+        task.cancel()
+        return await asyncio.gather(task, waiter, return_exceptions=True)
+
+    cancelled, result = asyncio.run(cancel_one())
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert result[0] == b"ABCconst c = 3;"
+    assert es2abc_mcp._compile_locks == {}
+
+
+def test_file_sources_share_the_cache(runs, tmp_path):
+    js_file = tmp_path / "input.js"
+    js_file.write_bytes(b"const d = 4;")
+    results = asyncio.run(_compile_all([js_file, js_file, "const d = 4;"]))
+
+    assert [r[0] for r in results] == [b"ABCconst d = 4;"] * 3
+    assert runs == [b"const d = 4;"]
+    assert es2abc_mcp._compile_locks == {}
+    assert list(es2abc_mcp._WORK_ROOT.iterdir()) == []
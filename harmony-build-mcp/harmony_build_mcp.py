@@ -7,26 +7,83 @@ using the hvigorw build system. Supports Windows, Linux, and macOS platforms.
 """
 
 import asyncio
+import collections
+import functools
+import hashlib
 import json
 import os
 import platform
+import re
 import shutil
+import stat
 import subprocess
 import tempfile
+import time
 import uuid
+from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Optional, List
 
 from mcp.server.fastmcp import FastMCP
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+
+try:
+    import json5
+except ImportError:  # Optional, see the "json5" extra
+    json5 = None
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
 
 # Initialize the MCP server
 mcp = FastMCP("harmony_build_mcp")
 
 # Constants
 TEMP_DIR = tempfile.gettempdir()
+# Host facts are fixed for the life of the process
+_PLATFORM = platform.system()
+_PLATFORM_LOWER = _PLATFORM.lower()
+_MACHINE = platform.machine()
+_PY_VERSION = platform.python_version()
+# hvigorw build script name for this platform, and the names probed for it
+_HVIGORW_NAME = "hvigorw.bat" if _PLATFORM_LOWER == "windows" else "hvigorw"
+_HVIGORW_CANDIDATES = (_HVIGORW_NAME, f"{_HVIGORW_NAME}.exe")
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5MB for log output
+CLEAN_LOG_SIZE = 5000  # Tail of the clean log kept in results
+
+
+def _user_cache_dir(name: str) -> Path:
+    """Per-user cache location: $XDG_CACHE_HOME, %LOCALAPPDATA% or ~/.cache."""
+    base = (os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return Path(base) / name
+
+
+# Fingerprints of the last successful build per (project, target, mode, module);
+# kept per user, since a planted state file would make a build look up to date
+BUILD_CACHE_DIR = Path(os.environ.get("HARMONY_BUILD_CACHE_DIR") or _user_cache_dir("harmony_build_mcp"))
+# Recent successful build results kept in process, keyed on fingerprint + params
+BUILD_RESULT_CACHE_SIZE = 32
+BUILD_RESULT_CACHE_TTL = 300  # seconds
+_build_result_cache: "collections.OrderedDict[tuple, tuple[float, dict]]" = collections.OrderedDict()
+# Build artifact types reported after a build
+_ARTIFACT_SUFFIXES = ('.hap', '.har', '.hsp', '.app')
+# Generated or third-party directories left out of project fingerprints when
+# directly under the project root or a module root, where hvigor writes them
+_FINGERPRINT_SKIP_DIRS = frozenset({
+    "build", ".hvigor", "oh_modules", "node_modules", ".git", ".idea", ".preview",
+})
+
+# Opt-in: with HARMONY_BUILD_DAEMON=1 builds keep the hvigor daemon warm so later
+# runs skip tool startup; by default hvigorw runs as before and leaves no daemon
+_DAEMON_ARGS = (
+    ["--daemon"]
+    if os.environ.get("HARMONY_BUILD_DAEMON", "").strip().lower() in ("1", "true", "yes", "on")
+    else []
+)
 
 
 class BuildTarget(str, Enum):
@@ -48,42 +105,61 @@ class ResponseFormat(str, Enum):
     JSON = "json"
 
 
+# Fallback scan for `name: "..."` entries when json5 is not installed;
+# accepts JSON5 quoting but also matches non-module names (e.g. targets)
+_MODULE_NAME_RE = re.compile(r"""["']?\bname["']?\s*:\s*(?:"([^"]+)"|'([^']+)')""")
+
+# Files and directories that mark a HarmonyOS project root
+_PROJECT_MARKERS = frozenset(os.path.normcase(name) for name in (
+    "build-profile.json5",
+    "hvigorfile.ts",
+    "oh-package.json5",
+    "AppScope",
+))
+
+
+def _dir_entries(directory: str) -> set[str]:
+    """List a directory once; names are normcased (case-insensitive on Windows)."""
+    try:
+        with os.scandir(directory) as it:
+            return {os.path.normcase(entry.name) for entry in it}
+    except OSError:
+        return set()
+
+
 def get_hvigorw_path(project_path: Path) -> Path:
     """
     Get the hvigorw executable path for the given project.
 
+    Lookups are cached per project; see _clear_project_caches().
+
     Args:
         project_path: Path to the HarmonyOS project
 
     Returns:
         Path to the hvigorw executable
     """
-    system = platform.system().lower()
+    return _get_hvigorw_path_cached(str(project_path))
 
-    if system == "windows":
-        hvigorw_name = "hvigorw.bat"
-    else:
-        hvigorw_name = "hvigorw"
-
-    # Check in project root
-    hvigorw_path = project_path / hvigorw_name
-    if hvigorw_path.exists():
-        return hvigorw_path
 
-    # Check in standard DevEco Studio project structure
-    for parent in [project_path, project_path.parent]:
-        for name in [hvigorw_name, f"{hvigorw_name}.exe"]:
-            path = parent / name
-            if path.exists():
-                return path
+@functools.lru_cache(maxsize=128)
+def _get_hvigorw_path_cached(project_dir: str) -> Path:
+    """Uncached hvigorw lookup, keyed on the project path string."""
+    # Check the project root, then its parent (standard DevEco Studio layout),
+    # listing each directory once instead of stat-ing every candidate
+    for parent in [project_dir, os.path.dirname(project_dir)]:
+        entries = _dir_entries(parent)
+        for name in _HVIGORW_CANDIDATES:
+            if os.path.normcase(name) in entries:
+                return Path(os.path.join(parent, name))
 
     # Check if hvigorw is in PATH
-    in_path = shutil.which(hvigorw_name)
+    in_path = shutil.which(_HVIGORW_NAME)
     if in_path:
         return Path(in_path)
 
     raise RuntimeError(
-        f"hvigorw executable not found for project: {project_path}. "
+        f"hvigorw executable not found for project: {project_dir}. "
         f"Please ensure this is a valid HarmonyOS project with hvigorw build script."
     )
 
@@ -92,76 +168,124 @@ def find_project_root(start_path: Path) -> Path:
     """
     Find the HarmonyOS project root by looking for build profile files.
 
+    Results are cached per start path; see _clear_project_caches().
+
     Args:
         start_path: Starting path to search from
 
     Returns:
         Path to the project root directory
     """
-    current = start_path.resolve()
-
-    # Look for project markers
-    markers = [
-        "build-profile.json5",
-        "hvigorfile.ts",
-        "oh-package.json5",
-        "AppScope",
-    ]
+    return _find_project_root_cached(str(start_path))
+
+
+@functools.lru_cache(maxsize=128)
+def _find_project_root_cached(start_dir: str) -> Path:
+    """Uncached project root search, keyed on the start path string."""
+    # Walk with plain strings; only the result is wrapped in a Path
+    current = os.path.realpath(start_dir)
 
     # Search up to 5 levels
     for _ in range(5):
-        for marker in markers:
-            if (current / marker).exists():
-                return current
-        parent = current.parent
+        if not _PROJECT_MARKERS.isdisjoint(_dir_entries(current)):
+            return Path(current)
+        parent = os.path.dirname(current)
         if parent == current:
             break
         current = parent
 
     # If start_path is a file, start from its parent
-    if start_path.is_file():
-        return find_project_root(start_path.parent)
+    if os.path.isfile(start_dir):
+        return _find_project_root_cached(os.path.dirname(start_dir))
 
-    return start_path
+    return Path(start_dir)
 
 
 def get_module_info(project_path: Path) -> dict:
     """
     Extract module information from the HarmonyOS project.
 
+    Parsed results are cached per project and build-profile.json5
+    modification time, so edits to the profile are picked up.
+
     Args:
         project_path: Path to the project
 
     Returns:
         Dictionary containing module information
     """
+    try:
+        profile_mtime = os.stat(os.path.join(project_path, "build-profile.json5")).st_mtime_ns
+    except OSError:
+        profile_mtime = None
+
+    info = _get_module_info_cached(str(project_path), profile_mtime)
+    return {**info, "modules": list(info["modules"])}
+
+
+@functools.lru_cache(maxsize=128)
+def _get_module_info_cached(project_dir: str, profile_mtime: Optional[int]) -> dict:
+    """Uncached module discovery; profile_mtime is None when there is no build profile."""
     info = {
         "modules": [],
-        "project_name": project_path.name,
-        "has_app_scope": (project_path / "AppScope").exists(),
+        "project_name": os.path.basename(project_dir),
+        "has_app_scope": os.path.exists(os.path.join(project_dir, "AppScope")),
     }
 
     # Find build-profile.json5 for module list
-    build_profile = project_path / "build-profile.json5"
-    if build_profile.exists():
+    if profile_mtime is not None:
         try:
-            content = build_profile.read_text(encoding='utf-8')
-            # Simple parsing for modules (basic implementation)
-            import re
-            module_matches = re.findall(r'"name"\s*:\s*"([^"]+)"', content)
-            info["modules"] = list(set(module_matches))
+            with open(os.path.join(project_dir, "build-profile.json5"), encoding='utf-8') as f:
+                content = f.read()
+            info["modules"] = _parse_module_names(content)
         except Exception:
             pass
 
     # Check for entry module
-    entry_path = project_path / "entry"
-    if entry_path.exists():
+    if os.path.exists(os.path.join(project_dir, "entry")):
         if "entry" not in info["modules"]:
             info["modules"].append("entry")
 
     return info
 
 
+def _parse_module_names(content: str) -> List[str]:
+    """
+    Extract module names from build-profile.json5 content.
+
+    With json5 installed this reads exactly `modules[*].name`; otherwise
+    every `name` entry in the file is collected.
+    """
+    if json5 is not None:
+        try:
+            modules = json5.loads(content).get("modules", [])
+            return list(dict.fromkeys(
+                module["name"] for module in modules
+                if isinstance(module, dict) and isinstance(module.get("name"), str)
+            ))
+        except Exception:
+            pass  # Fall back to the pattern scan
+
+    return list(dict.fromkeys(
+        double or single for double, single in _MODULE_NAME_RE.findall(content)
+    ))
+
+
+def _resolve_project_path(project_path: str) -> Path:
+    """Expand and resolve a project path, raising ValueError if it does not exist."""
+    path = Path(project_path).expanduser().resolve()
+    if not path.exists():
+        raise ValueError(f"Project path does not exist: {project_path}")
+    return path
+
+
+def _clear_project_caches() -> None:
+    """Forget cached project discovery results (hvigorw, project root, modules)."""
+    _get_hvigorw_path_cached.cache_clear()
+    _find_project_root_cached.cache_clear()
+    _get_module_info_cached.cache_clear()
+
+
 # Pydantic Models for Input Validation
 
 
@@ -194,11 +318,22 @@ class BuildInput(BaseModel):
         description="Specific module to build (e.g., 'entry'). If not specified, builds all modules"
     )
 
+    modules: Optional[List[str]] = Field(
+        default=None,
+        description="Several modules to build in one hvigorw run, which builds them in parallel (e.g., ['entry', 'mylibrary'])",
+        min_length=1
+    )
+
     clean: bool = Field(
         default=False,
         description="Clean build output before building (perform a clean build)"
     )
 
+    force: bool = Field(
+        default=False,
+        description="Always run hvigorw, even if the project is unchanged since the last successful build"
+    )
+
     output_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format: 'markdown' for human-readable or 'json' for machine-readable"
@@ -207,10 +342,28 @@ class BuildInput(BaseModel):
     @field_validator('project_path')
     @classmethod
     def validate_project_path(cls, v: str) -> str:
-        path = Path(v.strip()).expanduser().resolve()
-        if not path.exists():
-            raise ValueError(f"Project path does not exist: {v}")
-        return str(path)
+        # Syntactic only; resolving touches the filesystem, so the tools do it
+        # off the event loop via _resolve_project_path
+        v = v.strip()
+        if not v:
+            raise ValueError("Project path must not be empty")
+        return v
+
+    @field_validator('modules')
+    @classmethod
+    def validate_modules(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        if v is None:
+            return v
+        names = list(dict.fromkeys(name.strip() for name in v if name.strip()))
+        if not names:
+            raise ValueError("modules must contain at least one module name")
+        return names
+
+    @model_validator(mode='after')
+    def check_module_selection(self) -> 'BuildInput':
+        if self.module and self.modules:
+            raise ValueError("Specify either 'module' or 'modules', not both")
+        return self
 
 
 class BuildModuleInput(BaseModel):
@@ -243,6 +396,11 @@ class BuildModuleInput(BaseModel):
         description="Clean build output before building"
     )
 
+    force: bool = Field(
+        default=False,
+        description="Always run hvigorw, even if the project is unchanged since the last successful build"
+    )
+
     output_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format: 'markdown' or 'json'"
@@ -251,69 +409,242 @@ class BuildModuleInput(BaseModel):
     @field_validator('project_path')
     @classmethod
     def validate_project_path(cls, v: str) -> str:
-        path = Path(v.strip()).expanduser().resolve()
-        if not path.exists():
-            raise ValueError(f"Project path does not exist: {v}")
-        return str(path)
+        # Syntactic only; resolving touches the filesystem, so the tools do it
+        # off the event loop via _resolve_project_path
+        v = v.strip()
+        if not v:
+            raise ValueError("Project path must not be empty")
+        return v
 
 
 # Shared utility functions
 
 
+def _dumps(obj) -> str:
+    """Serialize a tool result as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
 def _format_build_result(result: dict, format: ResponseFormat) -> str:
     """Format build result based on requested format."""
     if format == ResponseFormat.JSON:
-        return json.dumps(result, indent=2, ensure_ascii=False)
-
-    # Markdown format
-    lines = [
-        "# HarmonyOS Build Result",
-        "",
-        "## Summary",
-        f"- **Status**: {'✅ Success' if result.get('success') else '❌ Failed'}",
-        f"- **Project**: `{result.get('project_name', 'N/A')}`",
-        f"- **Target**: {result.get('target', 'N/A').upper()}",
-        f"- **Mode**: {result.get('mode', 'N/A')}",
-        f"- **Platform**: {result.get('platform', 'N/A')}",
+        return _dumps(result)
+
+    # Markdown format: a fixed summary followed by optional sections, each
+    # rendered as one string and concatenated in a single join
+    header = (
+        "# HarmonyOS Build Result\n"
+        "\n"
+        "## Summary\n"
+        f"- **Status**: {'✅ Success' if result.get('success') else '❌ Failed'}\n"
+        f"- **Project**: `{result.get('project_name', 'N/A')}`\n"
+        f"- **Target**: {result.get('target', 'N/A').upper()}\n"
+        f"- **Mode**: {result.get('mode', 'N/A')}\n"
+        f"- **Platform**: {result.get('platform', 'N/A')}"
+    )
+
+    output_paths = result.get('output_paths')
+    log = result.get('build_log')
+    if log and len(log) > 2000:
+        log = log[:2000] + "\n... (truncated)"
+    error = result.get('error') if not result.get('success') else None
+
+    return "".join((
+        header,
+        f"\n- **Module**: {result['module']}" if result.get('module') else "",
+        f"\n- **Duration**: {result['duration']:.2f}s" if result.get('duration') else "",
+        "\n- **Cached**: Yes (project unchanged since the last successful build)" if result.get('cached') else "",
+        "\n\n## Output Artifacts\n" + "\n".join(f"- `{path}`" for path in output_paths) if output_paths else "",
+        f"\n\n## Build Log\n```\n{log}\n```" if log else "",
+        f"\n\n## Error\n```\n{error}\n```" if error else "",
+    ))
+
+
+async def _run_hvigorw(cmd: List[str], cwd: Path, max_bytes: int = MAX_LOG_SIZE) -> tuple[int, str]:
+    """
+    Run an hvigorw command and return its exit code and combined output.
+
+    Output is drained as it arrives and only the last max_bytes are kept,
+    so memory stays bounded however verbose the build is. A truncated log
+    starts with a "... (log truncated)" line.
+    """
+    # Python-created descriptors are non-inheritable (PEP 446), so the child
+    # need not close every fd up to the ulimit; the larger stream limit lets
+    # the pipe fill further before the transport pauses reading
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=cwd,
+        close_fds=False,
+        limit=1024 * 1024
+    )
+
+    chunks = collections.deque()
+    total = 0
+    truncated = False
+    while chunk := await process.stdout.read(64 * 1024):
+        chunks.append(chunk)
+        total += len(chunk)
+        # Drop whole chunks that fall entirely outside the kept tail
+        while total - len(chunks[0]) >= max_bytes:
+            total -= len(chunks.popleft())
+            truncated = True
+    await process.wait()
+
+    output = b"".join(chunks)
+    if len(output) > max_bytes:
+        output = output[-max_bytes:]
+        truncated = True
+
+    log = output.decode('utf-8', errors='replace')
+    if truncated:
+        log = "... (log truncated)\n" + log
+    return process.returncode, log
+
+
+def _find_output_paths(project_root: Path, output_dir: Path, mode: BuildMode) -> List[str]:
+    """Collect build artifacts (.hap/.har/.hsp/.app) from the standard output locations."""
+    output_paths = []
+
+    # Look for output in standard locations
+    search_paths = [
+        output_dir / "build" / "default" / "outputs" / "default",
+        output_dir / "build" / mode.value / "output",
+        project_root / "build" / "outputs" / "default",
     ]
 
-    if result.get('module'):
-        lines.append(f"- **Module**: {result['module']}")
+    # One walk per location, matching every artifact type at once
+    for search_path in search_paths:
+        if search_path.is_dir():
+            for root, _, files in os.walk(search_path):
+                for name in files:
+                    if os.path.normcase(name).endswith(_ARTIFACT_SUFFIXES):
+                        output_paths.append(os.path.join(root, name))
 
-    if result.get('duration'):
-        lines.append(f"- **Duration**: {result['duration']:.2f}s")
+    return output_paths
 
-    # Output paths
-    if result.get('output_paths'):
-        lines.extend([
-            "",
-            "## Output Artifacts"
-        ])
-        for path in result['output_paths']:
-            lines.append(f"- `{path}`")
-
-    # Build log
-    if result.get('build_log'):
-        log = result['build_log']
-        if len(log) > 2000:
-            log = log[:2000] + "\n... (truncated)"
-        lines.extend([
-            "",
-            "## Build Log",
-            "```",
-            log,
-            "```"
-        ])
 
-    # Error information
-    if not result.get('success') and result.get('error'):
-        lines.extend([
-            "",
-            "## Error",
-            f"```\n{result['error']}\n```"
-        ])
+def _compute_project_fingerprint(project_root: Path, modules: List[str] = ()) -> str:
+    """
+    Fingerprint a project from the (path, size, mtime) of its files.
+
+    Build outputs and dependency directories (_FINGERPRINT_SKIP_DIRS) are
+    not walked when they sit directly in the project root or in a module
+    directory, so building does not change the fingerprint; a source
+    directory of the same name deeper in the tree is still included. File
+    contents are never read; the metadata comes from the scandir walk alone.
+    """
+    root = str(project_root)
+    prefix_len = len(os.path.join(root, ""))
+    output_parents = {root, *(os.path.normpath(os.path.join(root, name)) for name in modules)}
+    files = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            it = os.scandir(directory)
+        except OSError:
+            continue
+        skip_dirs = _FINGERPRINT_SKIP_DIRS if directory in output_parents else ()
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_dirs:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        files.append((entry.path[prefix_len:], st.st_size, st.st_mtime_ns))
+                except OSError:
+                    continue
+
+    # Hash the whole listing in one call rather than one update per file
+    files.sort()
+    listing = "".join([f"{rel_path}\0{size}\0{mtime_ns}\n" for rel_path, size, mtime_ns in files])
+    return hashlib.blake2b(listing.encode('utf-8', errors='surrogatepass'), digest_size=16).hexdigest()
+
+
+def _build_state_path(project_root: Path, target: BuildTarget, mode: BuildMode,
+                      module: Optional[str]) -> Path:
+    """Location of the saved state for one build configuration of a project."""
+    key = f"{project_root}\0{target.value}\0{mode.value}\0{module or ''}"
+    digest = hashlib.blake2b(key.encode('utf-8', errors='surrogatepass'), digest_size=16)
+    return BUILD_CACHE_DIR / f"{digest.hexdigest()}.json"
+
+
+def _ensure_private_dir(path: Path) -> bool:
+    """
+    Create path with mode 0o700 if missing; True if only this user can write to it.
+
+    A directory owned by someone else, or writable by group or others, is
+    refused so its contents are never trusted.
+    """
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o022):
+        return False
+    return True
+
+
+def _load_build_state(path: Path) -> Optional[dict]:
+    """Read a saved build state; None if missing, unreadable, untrusted or without artifacts."""
+    if not _ensure_private_dir(path.parent):
+        return None
+    try:
+        state = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or not state.get("artifacts"):
+        return None
+    return state
+
+
+def _save_build_state(path: Path, state: dict) -> None:
+    """Atomically save a build state; failures only cost a future rebuild."""
+    if not _ensure_private_dir(path.parent):
+        return
+    try:
+        fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(state, ensure_ascii=False))
+        os.replace(tmp_name, path)
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+
 
-    return "\n".join(lines)
+def _get_cached_build_result(key: tuple) -> Optional[dict]:
+    """Return a copy of a recent build result for key, or None if absent or expired."""
+    entry = _build_result_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > BUILD_RESULT_CACHE_TTL:
+        del _build_result_cache[key]
+        return None
+    _build_result_cache.move_to_end(key)
+    return {**result, "output_paths": list(result["output_paths"])}
+
+
+def _cache_build_result(key: tuple, result: dict) -> None:
+    """Remember a successful build result, evicting the least recently used."""
+    _build_result_cache[key] = (time.monotonic(), {**result, "output_paths": list(result["output_paths"])})
+    _build_result_cache.move_to_end(key)
+    while len(_build_result_cache) > BUILD_RESULT_CACHE_SIZE:
+        _build_result_cache.popitem(last=False)
 
 
 async def _execute_build(
@@ -321,24 +652,42 @@ async def _execute_build(
     target: BuildTarget,
     mode: BuildMode,
     module: Optional[str] = None,
-    clean: bool = False
+    clean: bool = False,
+    force: bool = False,
+    modules: Optional[List[str]] = None
 ) -> dict:
     """
     Execute the HarmonyOS build process.
 
+    If the project fingerprint matches the last successful build of the
+    same configuration and its artifacts still exist, hvigorw is not run
+    and the result is marked "cached" (unless force or clean is set). A
+    build repeated within BUILD_RESULT_CACHE_TTL returns the original
+    result, log included, from memory.
+
+    Several modules are built by one hvigorw run that lists each module's
+    assemble task; hvigor schedules independent tasks in parallel itself,
+    so the modules never compete for the project's .hvigor and build state.
+
     Args:
         project_path: Path to the project
         target: Build target type
         mode: Build mode
         module: Specific module to build
         clean: Whether to clean before build
+        force: Whether to build even if the project is unchanged
+        modules: Several modules to build in one run (instead of module)
 
     Returns:
         Dictionary containing build results
     """
-    import time
     start_time = time.time()
 
+    # Modules whose tasks are run; empty builds the whole project
+    names = modules or ([module] if module else [])
+    if modules:
+        module = ", ".join(modules)
+
     result = {
         "success": False,
         "project_path": str(project_path),
@@ -346,11 +695,13 @@ async def _execute_build(
         "target": target.value,
         "mode": mode.value,
         "module": module,
-        "platform": platform.system(),
+        "platform": _PLATFORM,
         "output_paths": [],
         "build_log": "",
         "error": None
     }
+    if modules:
+        result["modules"] = modules
 
     try:
         # Find project root and hvigorw
@@ -362,12 +713,44 @@ async def _execute_build(
         module_info = get_module_info(project_root)
         result["available_modules"] = module_info["modules"]
 
+        # Reuse the last successful build when nothing has changed since
+        state_path = _build_state_path(project_root, target, mode, module)
+        state = None if force or clean else _load_build_state(state_path)
+        fingerprint = None
+        if state is not None:
+            fingerprint = await asyncio.to_thread(
+                _compute_project_fingerprint, project_root, module_info["modules"]
+            )
+            if (state.get("fingerprint") == fingerprint
+                    and all(os.path.exists(p) for p in state["artifacts"])):
+                cached_result = _get_cached_build_result(
+                    (str(project_root), fingerprint, target.value, mode.value, module)
+                )
+                if cached_result is not None:
+                    cached_result.update({
+                        "cached": True,
+                        "duration": time.time() - start_time
+                    })
+                    return cached_result
+                result.update({
+                    "success": True,
+                    "cached": True,
+                    "exit_code": 0,
+                    "output_paths": state["artifacts"],
+                    "build_log": (
+                        "Build skipped: project unchanged since the last successful "
+                        f"build at {state.get('last_success')}. Use force=true to rebuild."
+                    )
+                })
+                result["duration"] = time.time() - start_time
+                return result
+
         # Build command
         cmd = [str(hvigorw_path)]
 
-        # Add module if specified
-        if module:
-            cmd.append(f":{module}:assemble{mode.value}")
+        # Add modules if specified
+        if names:
+            cmd.extend(f":{name}:assemble{mode.value}" for name in names)
         else:
             # Build all modules
             cmd.append(f"assemble{mode.value}")
@@ -375,71 +758,63 @@ async def _execute_build(
         # Add target-specific options
         if target == BuildTarget.HAR:
             cmd.append("--publish-har")
+        cmd.extend(_DAEMON_ARGS)
 
         # Execute clean if requested
         if clean:
             clean_cmd = [str(hvigorw_path)]
-            if module:
-                clean_cmd.append(f":{module}:clean")
+            if names:
+                clean_cmd.extend(f":{name}:clean" for name in names)
             else:
                 clean_cmd.append("clean")
+            clean_cmd.extend(_DAEMON_ARGS)
 
             try:
-                clean_process = await asyncio.create_subprocess_exec(
-                    *clean_cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.STDOUT,
-                    cwd=project_root
-                )
-                await clean_process.communicate()
+                await _run_hvigorw(clean_cmd, project_root)
             except Exception:
                 pass  # Clean failure is not critical
 
-        # Execute build
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.STDOUT,
-            cwd=project_root
-        )
+        # Snapshot the project before building so edits made while hvigorw
+        # runs are not recorded as built
+        if fingerprint is None:
+            fingerprint = await asyncio.to_thread(
+                _compute_project_fingerprint, project_root, module_info["modules"]
+            )
 
-        stdout, _ = await process.communicate()
-        build_log = stdout.decode('utf-8', errors='replace')
-
-        # Truncate log if too large
-        if len(build_log) > MAX_LOG_SIZE:
-            build_log = build_log[:MAX_LOG_SIZE] + "\n... (log truncated)"
+        # Execute build
+        returncode, build_log = await _run_hvigorw(cmd, project_root)
 
         result["build_log"] = build_log
-        result["exit_code"] = process.returncode
+        result["exit_code"] = returncode
 
         # Find output files
-        output_dir = project_root
-        if module:
-            output_dir = project_root / module
+        if names:
+            output_paths = {}
+            for name in names:
+                module_paths = _find_output_paths(project_root, project_root / name, mode)
+                output_paths.update(dict.fromkeys(module_paths))
+            result["output_paths"] = list(output_paths)
         else:
             # Find entry module default
+            output_dir = project_root
             entry_path = project_root / "entry"
             if entry_path.exists():
                 output_dir = entry_path
+            result["output_paths"] = _find_output_paths(project_root, output_dir, mode)
 
-        # Look for output in standard locations
-        search_paths = [
-            output_dir / "build" / "default" / "outputs" / "default",
-            output_dir / "build" / mode.value / "output",
-            project_root / "build" / "outputs" / "default",
-        ]
-
-        for search_path in search_paths:
-            if search_path.exists():
-                for ext in ['*.hap', '*.har', '*.hsp', '*.app']:
-                    for file in search_path.rglob(ext):
-                        result["output_paths"].append(str(file))
-
-        result["success"] = process.returncode == 0
+        result["success"] = returncode == 0
 
         if not result["success"]:
-            result["error"] = f"Build failed with exit code {process.returncode}"
+            result["error"] = f"Build failed with exit code {returncode}"
+        elif result["output_paths"]:
+            _save_build_state(state_path, {
+                "fingerprint": fingerprint,
+                "last_success": datetime.now().isoformat(timespec='seconds'),
+                "artifacts": result["output_paths"]
+            })
+            _cache_build_result(
+                (str(project_root), fingerprint, target.value, mode.value, module), result
+            )
 
     except Exception as e:
         result["error"] = f"{type(e).__name__}: {str(e)}"
@@ -477,7 +852,9 @@ async def harmony_build(params: BuildInput) -> str:
             - target (BuildTarget): Build target type (hap/har/hsp)
             - mode (BuildMode): Build mode (debug/release)
             - module (Optional[str]): Specific module to build
+            - modules (Optional[List[str]]): Modules to build together in one run
             - clean (bool): Whether to clean before building
+            - force (bool): Whether to build even if the project is unchanged
             - output_format (ResponseFormat): Response format (markdown/json)
 
     Returns:
@@ -494,6 +871,7 @@ async def harmony_build(params: BuildInput) -> str:
         - Use when: "Build my HarmonyOS project" with project_path="/path/to/project"
         - Use when: "Build in release mode" with mode="release"
         - Use when: "Build the entry module" with module="entry"
+        - Use when: "Build entry and mylibrary in parallel" with modules=["entry", "mylibrary"]
         - Use when: "Do a clean build" with clean=true
 
     Error Handling:
@@ -506,13 +884,15 @@ async def harmony_build(params: BuildInput) -> str:
         - Linux/macOS: Uses hvigorw
     """
     try:
-        project_path = Path(params.project_path)
+        project_path = await asyncio.to_thread(_resolve_project_path, params.project_path)
         result = await _execute_build(
             project_path,
             params.target,
             params.mode,
             params.module,
-            params.clean
+            params.clean,
+            params.force,
+            params.modules
         )
         return _format_build_result(result, params.output_format)
 
@@ -544,6 +924,7 @@ async def harmony_build_module(params: BuildModuleInput) -> str:
             - module_name (str): Name of the module to build
             - mode (BuildMode): Build mode (debug/release)
             - clean (bool): Whether to clean before building
+            - force (bool): Whether to build even if the project is unchanged
             - output_format (ResponseFormat): Response format (markdown/json)
 
     Returns:
@@ -558,7 +939,7 @@ async def harmony_build_module(params: BuildModuleInput) -> str:
         - Returns build logs on failure
     """
     try:
-        project_path = Path(params.project_path)
+        project_path = await asyncio.to_thread(_resolve_project_path, params.project_path)
 
         # Verify module exists
         project_root = find_project_root(project_path)
@@ -571,7 +952,8 @@ async def harmony_build_module(params: BuildModuleInput) -> str:
             BuildTarget.HAP,  # Default to HAP for modules
             params.mode,
             params.module_name,
-            params.clean
+            params.clean,
+            params.force
         )
         return _format_build_result(result, params.output_format)
 
@@ -609,35 +991,31 @@ async def harmony_clean(project_path: str, output_format: ResponseFormat = Respo
         - Use when: "Remove build artifacts"
     """
     try:
-        path = Path(project_path).expanduser().resolve()
-        if not path.exists():
-            return f"Error: Project path does not exist: {project_path}"
+        try:
+            path = await asyncio.to_thread(_resolve_project_path, project_path)
+        except ValueError as e:
+            return f"Error: {e}"
+
+        # A clean is the caller's signal that the project may have changed
+        _clear_project_caches()
+        _build_result_cache.clear()
 
         project_root = find_project_root(path)
         hvigorw_path = get_hvigorw_path(project_root)
 
-        cmd = [str(hvigorw_path), "clean"]
-
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.STDOUT,
-            cwd=project_root
-        )
-
-        stdout, _ = await process.communicate()
-        log = stdout.decode('utf-8', errors='replace')
+        cmd = [str(hvigorw_path), "clean", *_DAEMON_ARGS]
+        returncode, log = await _run_hvigorw(cmd, project_root, max_bytes=CLEAN_LOG_SIZE)
 
         result = {
-            "success": process.returncode == 0,
+            "success": returncode == 0,
             "project_path": str(project_root),
             "action": "clean",
-            "exit_code": process.returncode,
-            "log": log[:5000] if len(log) > 5000 else log
+            "exit_code": returncode,
+            "log": log
         }
 
         if output_format == ResponseFormat.JSON:
-            return json.dumps(result, indent=2, ensure_ascii=False)
+            return _dumps(result)
 
         lines = [
             "# HarmonyOS Clean Result",
@@ -656,6 +1034,73 @@ async def harmony_clean(project_path: str, output_format: ResponseFormat = Respo
         return f"Error: {type(e).__name__}: {str(e)}"
 
 
+@mcp.tool(
+    name="harmony_stop_daemon",
+    annotations={
+        "title": "Stop HarmonyOS Build Daemon",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False
+    }
+)
+async def harmony_stop_daemon(project_path: str, output_format: ResponseFormat = ResponseFormat.MARKDOWN) -> str:
+    """Stop the hvigor daemon kept warm between builds.
+
+    Builds run hvigorw with --daemon so later builds skip tool startup.
+    This tool runs `hvigorw --stop-daemon` to release that process.
+
+    Args:
+        project_path (str): Path to the HarmonyOS project directory
+        output_format (ResponseFormat): Response format (markdown/json)
+
+    Returns:
+        str: Formatted stop result
+
+    Examples:
+        - Use when: "Stop the build daemon"
+        - Use when: Finishing a build session and freeing memory
+    """
+    try:
+        try:
+            path = await asyncio.to_thread(_resolve_project_path, project_path)
+        except ValueError as e:
+            return f"Error: {e}"
+
+        project_root = find_project_root(path)
+        hvigorw_path = get_hvigorw_path(project_root)
+
+        cmd = [str(hvigorw_path), "--stop-daemon"]
+        returncode, log = await _run_hvigorw(cmd, project_root, max_bytes=CLEAN_LOG_SIZE)
+
+        result = {
+            "success": returncode == 0,
+            "project_path": str(project_root),
+            "action": "stop_daemon",
+            "exit_code": returncode,
+            "log": log
+        }
+
+        if output_format == ResponseFormat.JSON:
+            return _dumps(result)
+
+        lines = [
+            "# HarmonyOS Daemon Stop Result",
+            "",
+            f"**Status**: {'✅ Success' if result['success'] else '❌ Failed'}",
+            f"**Project**: `{result['project_path']}`",
+            "",
+            "## Log",
+            "```",
+            result['log'],
+            "```"
+        ]
+        return "\n".join(lines)
+
+    except Exception as e:
+        return f"Error: {type(e).__name__}: {str(e)}"
+
+
 @mcp.tool(
     name="harmony_get_project_info",
     annotations={
@@ -684,9 +1129,10 @@ async def harmony_get_project_info(project_path: str, output_format: ResponseFor
         - Use when: "What modules are in this project?"
     """
     try:
-        path = Path(project_path).expanduser().resolve()
-        if not path.exists():
-            return f"Error: Project path does not exist: {project_path}"
+        try:
+            path = await asyncio.to_thread(_resolve_project_path, project_path)
+        except ValueError as e:
+            return f"Error: {e}"
 
         project_root = find_project_root(path)
         module_info = get_module_info(project_root)
@@ -704,11 +1150,11 @@ async def harmony_get_project_info(project_path: str, output_format: ResponseFor
             "has_app_scope": module_info["has_app_scope"],
             "modules": module_info["modules"],
             "hvigorw_path": hvigorw_path,
-            "platform": platform.system()
+            "platform": _PLATFORM
         }
 
         if output_format == ResponseFormat.JSON:
-            return json.dumps(result, indent=2, ensure_ascii=False)
+            return _dumps(result)
 
         lines = [
             "# HarmonyOS Project Information",
@@ -765,23 +1211,21 @@ async def harmony_build_get_status() -> str:
     """
     status = {
         "available": True,
-        "platform": platform.system(),
-        "architecture": platform.machine(),
-        "python_version": platform.python_version(),
+        "platform": _PLATFORM,
+        "architecture": _MACHINE,
+        "python_version": _PY_VERSION,
         "supported_targets": [t.value for t in BuildTarget],
         "supported_modes": [m.value for m in BuildMode]
     }
 
     # Try to find DevEco Studio or hvigorw in common locations
-    common_paths = []
-    system = platform.system().lower()
 
-    if system == "windows":
+    if _PLATFORM_LOWER == "windows":
         possible_roots = [
             Path("C:/DevecoStudio"),
             Path(os.path.expanduser("~/AppData/Local/DevecoStudio")),
         ]
-    elif system == "darwin":
+    elif _PLATFORM_LOWER == "darwin":
         possible_roots = [
             Path("/Applications/DevEco-Studio.app"),
         ]
@@ -791,14 +1235,16 @@ async def harmony_build_get_status() -> str:
             Path("/opt/devecostudio"),
         ]
 
-    for root in possible_roots:
-        if root.exists():
-            common_paths.append(str(root))
+    # Probe concurrently; on network homes or under antivirus each stat can be slow
+    exists = await asyncio.gather(
+        *(asyncio.to_thread(os.path.exists, root) for root in possible_roots)
+    )
+    common_paths = [str(root) for root, found in zip(possible_roots, exists) if found]
 
     status["common_installation_paths"] = common_paths
     status["common_installation_paths_found"] = len(common_paths) > 0
 
-    return json.dumps(status, indent=2, ensure_ascii=False)
+    return _dumps(status)
 
 
 if __name__ == "__main__":
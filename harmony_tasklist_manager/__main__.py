@@ -10,27 +10,25 @@ from pathlib import Path
 _server_dir = Path(__file__).parent.absolute()
 _src_dir = _server_dir / "src"
 
-# 关键：需要将 _src_dir 添加到 sys.path，这样 "from src.search" 才能工作
+# 关键：需要将 _server_dir 添加到 sys.path，这样 "from src.search" 才能工作
 # 但是要确保它能作为 "src" 包被导入
-if str(_server_dir) not in sys.path:
-    sys.path.insert(0, str(_server_dir))
-
-# 添加项目根目录到路径（用于导入 mcp_servers.logging_config 等）
+# 同时添加项目根目录到路径（用于导入 mcp_servers.logging_config 等）
 _project_root = _server_dir.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+_path_set = set(sys.path)
+for _path in (str(_server_dir), str(_project_root)):
+    if _path not in _path_set:
+        sys.path.insert(0, _path)
+        _path_set.add(_path)
 
 # 设置数据文件环境变量（优先使用已存在的环境变量，否则使用默认路径）
 # 这样用户可以在 config/mcp_servers.json 的 env 字段中自定义路径
-if "HARMONY_DATA_FILE" not in os.environ:
-    os.environ["HARMONY_DATA_FILE"] = str(_server_dir / "data" / "tasklist.txt")
-
-if "HARMONY_TITLE_FILE" not in os.environ:
-    os.environ["HARMONY_TITLE_FILE"] = str(_server_dir / "data" / "title.txt")
-
 # 日志级别也可以通过环境变量配置
-if "HARMONY_LOG_LEVEL" not in os.environ:
-    os.environ["HARMONY_LOG_LEVEL"] = "INFO"
+for _key, _value in (
+    ("HARMONY_DATA_FILE", str(_server_dir / "data" / "tasklist.txt")),
+    ("HARMONY_TITLE_FILE", str(_server_dir / "data" / "title.txt")),
+    ("HARMONY_LOG_LEVEL", "INFO"),
+):
+    os.environ.setdefault(_key, _value)
 
 # 现在导入 src.main（因为 _server_dir 在 sys.path 中，所以 "from src.xxx" 能正确解析）
 from src import main
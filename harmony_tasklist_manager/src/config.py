@@ -1,15 +1,23 @@
 """Configuration management for the HarmonyOS Task List Manager."""
 
 import os
+import copy
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from datetime import timedelta
 
-import yaml
-
 logger = logging.getLogger(__name__)
 
+# Defaults merged with the config file, keyed on (path, mtime_ns); entries
+# are deep-copied on use because environment overrides mutate the result
+_CONFIG_CACHE: Dict[Tuple[str, int], dict] = {}
+
+
+def env_flag(name: str) -> bool:
+    """Whether an on/off environment variable is on ("", "0", "false", "no" and "off" are off)."""
+    return os.getenv(name, "").strip().lower() not in ("", "0", "false", "no", "off")
+
 
 class Config:
     """Configuration manager."""
@@ -56,18 +64,34 @@ class Config:
         return "config.yaml"
 
     def _load_config(self) -> dict:
-        """Load configuration file."""
-        config = self.DEFAULTS.copy()
+        """Load configuration file (parsed once per file modification)."""
+        config = None
 
         config_path = Path(self.config_path)
-        if config_path.exists():
-            try:
-                with open(config_path, "r", encoding="utf-8") as f:
-                    user_config = yaml.safe_load(f)
+        try:
+            key = (str(config_path), config_path.stat().st_mtime_ns)
+        except OSError:
+            key = None  # No config file
+
+        if key is not None:
+            if key in _CONFIG_CACHE:
+                config = _CONFIG_CACHE[key]
+            else:
+                try:
+                    import yaml  # Deferred: only needed when a config file exists
+
+                    # libyaml's loader when PyYAML was built with it
+                    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                    with open(config_path, "r", encoding="utf-8") as f:
+                        user_config = yaml.load(f, Loader=loader)
+                    config = self.DEFAULTS
                     if user_config:
                         config = self._deep_merge(config, user_config)
-            except Exception as e:
-                logger.warning(f"Failed to load config file: {e}")
+                    _CONFIG_CACHE[key] = config
+                except Exception as e:
+                    logger.warning(f"Failed to load config file: {e}")
+
+        config = copy.deepcopy(config if config is not None else self.DEFAULTS)
 
         # Apply environment variable overrides
         self._apply_env_overrides(config)
@@ -76,17 +100,18 @@ class Config:
 
     @staticmethod
     def _deep_merge(base: dict, override: dict) -> dict:
-        """Deep merge dictionaries."""
+        """Deep merge dictionaries (iteratively; neither input is modified)."""
         result = base.copy()
-        for key, value in override.items():
-            if (
-                key in result
-                and isinstance(result[key], dict)
-                and isinstance(value, dict)
-            ):
-                result[key] = Config._deep_merge(result[key], value)
-            else:
-                result[key] = value
+        stack = [(result, override)]
+        while stack:
+            dst, src = stack.pop()
+            for key, value in src.items():
+                if isinstance(value, dict) and isinstance(dst.get(key), dict):
+                    # Copy before descending so nested dicts of base stay intact
+                    dst[key] = dst[key].copy()
+                    stack.append((dst[key], value))
+                else:
+                    dst[key] = value
         return result
 
     def _apply_env_overrides(self, config: dict):
@@ -13,9 +13,13 @@ from pathlib import Path
 from typing import Any, Optional
 
 from mcp.server import Server
-from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
+
 # 获取服务器根目录（包含 data/ 和 src/ 的目录）
 _server_root = Path(__file__).parent.parent.absolute()
 src_dir = _server_root / "src"
@@ -29,8 +33,9 @@ os.environ["HARMONY_TITLE_FILE"] = str(_server_root / "data" / "title.txt")
 _project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(_project_root))
 
-from src.config import Config
-from src.search import DataManager
+from src.config import Config, env_flag
+from src.search import DataManager, AdvancedSearcher
+from src.transport import stdio_server, get_buffer_size
 from src.models import error_response, ValidationError
 
 # 导入MCP日志配置
@@ -50,11 +55,15 @@ data_manager = DataManager(
     title_file_path=config.title_file_path,
     data_file_path=config.data_file_path,
     cache_ttl=config.cache_ttl,
+    persist_cache=env_flag("HARMONY_PERSIST_CACHE"),
 )
 
 # Create MCP server
 server = Server("harmony-tasklist-manager")
 
+# Responses are read by programs, so JSON is compact unless asked otherwise
+PRETTY_JSON = env_flag("HARMONY_PRETTY_JSON")
+
 
 # Helper functions
 def validate_limit(limit: Optional[int], max_limit: int, default: int) -> int:
@@ -78,11 +87,20 @@ def validate_offset(offset: Optional[int]) -> int:
 
 
 def to_json_response(data: Any) -> list[TextContent]:
-    """Convert dict to JSON TextContent response."""
-    return [TextContent(
-        type="text",
-        text=json.dumps(data, ensure_ascii=False, indent=2)
-    )]
+    """Convert dict to JSON TextContent response (orjson when installed).
+
+    Output is compact; set HARMONY_PRETTY_JSON to indent it for debugging.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if PRETTY_JSON:
+            option |= orjson.OPT_INDENT_2
+        text = orjson.dumps(data, option=option).decode("utf-8")
+    elif PRETTY_JSON:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return [TextContent(type="text", text=text)]
 
 
 def handle_error(error: Exception, context: str) -> list[TextContent]:
@@ -93,124 +111,127 @@ def handle_error(error: Exception, context: str) -> list[TextContent]:
     return to_json_response(error_response("InternalError", str(error)))
 
 
-# Tool definitions
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
-        Tool(
-            name="get_all_tasks",
-            description="Get all tasks from the task list with pagination support",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "number",
-                        "description": "Maximum number of results (default: 100, max: 1000)"
-                    },
-                    "offset": {
-                        "type": "number",
-                        "description": "Pagination offset (default: 0)"
-                    }
+# Tool definitions (static, so built once rather than per tools/list request)
+_TOOLS: list[Tool] = [
+    Tool(
+        name="get_all_tasks",
+        description="Get all tasks from the task list with pagination support",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "number",
+                    "description": "Maximum number of results (default: 100, max: 1000)"
+                },
+                "offset": {
+                    "type": "number",
+                    "description": "Pagination offset (default: 0)"
                 }
             }
-        ),
-        Tool(
-            name="search_tasks",
-            description="Search tasks by keyword across multiple fields",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "Search keyword"},
-                    "fields": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of fields to search (default: all fields)"
-                    },
-                    "case_sensitive": {
-                        "type": "boolean",
-                        "description": "Whether to distinguish case (default: false)"
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Maximum number of results (default: 100)"
-                    }
+        }
+    ),
+    Tool(
+        name="search_tasks",
+        description="Search tasks by keyword across multiple fields",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search keyword"},
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of fields to search (default: all fields)"
                 },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="get_task_by_id",
-            description="Get a single task by task_id",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "The task ID to search for"}
+                "case_sensitive": {
+                    "type": "boolean",
+                    "description": "Whether to distinguish case (default: false)"
                 },
-                "required": ["task_id"]
-            }
-        ),
-        Tool(
-            name="get_field_metadata",
-            description="Get field metadata information with descriptions",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="filter_tasks",
-            description="Filter tasks by multiple field conditions",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "filters": {
-                        "type": "object",
-                        "description": "Dictionary of {field: value} conditions"
-                    },
-                    "match_mode": {
-                        "type": "string",
-                        "enum": ["all", "any"],
-                        "description": "'all' (all conditions must match) or 'any' (any condition matches)"
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Maximum number of results (default: 100)"
-                    }
+                "limit": {
+                    "type": "number",
+                    "description": "Maximum number of results (default: 100)"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="get_task_by_id",
+        description="Get a single task by task_id",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "The task ID to search for"}
+            },
+            "required": ["task_id"]
+        }
+    ),
+    Tool(
+        name="get_field_metadata",
+        description="Get field metadata information with descriptions",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="filter_tasks",
+        description="Filter tasks by multiple field conditions",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "filters": {
+                    "type": "object",
+                    "description": "Dictionary of {field: value} conditions"
                 },
-                "required": ["filters"]
-            }
-        ),
-        Tool(
-            name="get_statistics",
-            description="Get task statistics, optionally grouped by a field",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "group_by": {
-                        "type": "string",
-                        "description": "Field name to group statistics by (optional)"
-                    }
+                "match_mode": {
+                    "type": "string",
+                    "enum": ["all", "any"],
+                    "description": "'all' (all conditions must match) or 'any' (any condition matches)"
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Maximum number of results (default: 100)"
+                }
+            },
+            "required": ["filters"]
+        }
+    ),
+    Tool(
+        name="get_statistics",
+        description="Get task statistics, optionally grouped by a field",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "group_by": {
+                    "type": "string",
+                    "description": "Field name to group statistics by (optional)"
                 }
             }
-        ),
-        Tool(
-            name="get_server_config",
-            description="Get current server configuration",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="reload_data",
-            description="Force reload data from files (clear cache)",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-    ]
+        }
+    ),
+    Tool(
+        name="get_server_config",
+        description="Get current server configuration",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="reload_data",
+        description="Force reload data from files (clear cache)",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+]
+
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools."""
+    return _TOOLS
 
 
 @server.call_tool()
@@ -226,22 +247,13 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             offset = validate_offset(arguments.get("offset"))
 
             tasks = data_manager.get_tasks()
-            fields = data_manager.get_fields()
+            fields_metadata = data_manager.get_fields_metadata()
 
             total = len(tasks)
             start = offset
             end = start + limit
             paginated_tasks = tasks[start:end]
 
-            fields_metadata = {
-                f.key: {
-                    "name": f.en_name,
-                    "label": f.cn_short_name,
-                    "description": f.cn_full_name,
-                }
-                for f in fields
-            }
-
             return to_json_response({
                 "success": True,
                 "total": total,
@@ -262,11 +274,11 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             )
 
             tasks = data_manager.get_tasks()
-            field_list = data_manager.get_fields()
-
-            from src.search import TaskSearcher
-            searcher = TaskSearcher(field_list)
-            result = searcher.search(tasks, query, fields, case_sensitive)
+            searcher = data_manager.get_searcher()
+            result = searcher.search(
+                tasks, query, fields, case_sensitive,
+                index=data_manager.get_search_index(tasks),
+            )
 
             result["tasks"] = result["tasks"][:limit]
             result["returned"] = len(result["tasks"])
@@ -275,27 +287,15 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 
         elif name == "get_task_by_id":
             task_id = arguments["task_id"]
-            tasks = data_manager.get_tasks()
+            task = data_manager.get_task_by_id(task_id)
 
-            for task in tasks:
-                if task.get("task_id") == task_id:
-                    return to_json_response({"success": True, "task": task})
+            if task is not None:
+                return to_json_response({"success": True, "task": task})
 
             return to_json_response({"success": False, "error": f"Task not found: {task_id}"})
 
         elif name == "get_field_metadata":
-            fields = data_manager.get_fields()
-
-            field_list = [
-                {
-                    "key": f.key,
-                    "name": f.en_name,
-                    "label": f.cn_short_name,
-                    "description": f.cn_full_name,
-                    "index": f.index,
-                }
-                for f in fields
-            ]
+            field_list = data_manager.get_field_list()
 
             return to_json_response({
                 "success": True,
@@ -316,9 +316,10 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 raise ValidationError('match_mode must be "all" or "any"')
 
             tasks = data_manager.get_tasks()
-
-            from src.search import AdvancedSearcher
-            result = AdvancedSearcher.filter_by_conditions(tasks, filters, match_mode)
+            result = AdvancedSearcher.filter_by_conditions(
+                tasks, filters, match_mode,
+                index=data_manager.get_filter_index(tasks),
+            )
 
             result["tasks"] = result["tasks"][:limit]
             result["returned"] = len(result["tasks"])
@@ -327,10 +328,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 
         elif name == "get_statistics":
             group_by = arguments.get("group_by")
-            tasks = data_manager.get_tasks()
-
-            from src.search import AdvancedSearcher
-            result = AdvancedSearcher.get_statistics(tasks, group_by)
+            result = data_manager.get_statistics(group_by)
 
             return to_json_response(result)
 
@@ -377,7 +375,7 @@ async def main():
     logger.info(f"Data file: {config.data_file_path}")
     logger.info(f"Title file: {config.title_file_path}")
 
-    async with stdio_server() as (read_stream, write_stream):
+    async with stdio_server(get_buffer_size()) as (read_stream, write_stream):
         await server.run(
             read_stream,
             write_stream,
@@ -1,6 +1,8 @@
 """Data parsers for title.txt and tasklist files."""
 
+import csv
 import logging
+import sys
 from pathlib import Path
 from typing import Optional
 
@@ -8,6 +10,27 @@ from .models import FieldMetadata, DataFileError, ParseError, error_response
 
 logger = logging.getLogger(__name__)
 
+# Data fields have no length cap, but csv.reader rejects fields over 128 KiB by
+# default; raise the limit (clamped to what a C long holds on every platform)
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+# Fields drawn from a small set of values; interned while parsing so rows
+# share one string object per distinct value (risk tags are interned too)
+LOW_CARDINALITY_FIELDS = frozenset({
+    "responsible_person",
+    "developer",
+    "supported_devices",
+    "popularity_level",
+    "submission_date",
+    "analysis_date",
+    "auto_detection_result",
+    "manual_analysis_conclusion",
+    "risk_level",
+    "reverse_engineering_tool",
+    "last_analysis_time",
+    "last_analysis_conclusion",
+})
+
 
 def safe_read_file(file_path: str) -> tuple[bool, str, Optional[list[str]]]:
     """
@@ -98,6 +121,59 @@ def parse_title_file(file_path: str) -> list[FieldMetadata]:
     return fields
 
 
+def _parse_rows(
+    file_path: str, fields: list[FieldMetadata], encoding: str
+) -> list[dict]:
+    """Parse data rows with the C csv reader (tab-separated, no quoting)."""
+    keys = [field.key for field in fields]
+    indices = [field.index for field in fields]
+    contiguous = indices == list(range(len(indices)))
+    width = max(indices, default=-1) + 1
+    risk_pos = keys.index("risk_tags") if "risk_tags" in keys else -1
+    head_keys, tail_keys = keys[:risk_pos], keys[risk_pos + 1:]
+    intern_positions = [i for i, key in enumerate(keys) if key in LOW_CARDINALITY_FIELDS]
+    intern = sys.intern
+
+    tasks = []
+    with open(file_path, "r", encoding=encoding, newline="") as f:
+        reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        for row in reader:
+            # Skip empty lines
+            if not row or (not row[0].strip() and not "".join(row).strip()):
+                continue
+
+            # Same trimming as stripping the whole line: blank edge columns
+            # are dropped along with the outer whitespace
+            while not row[-1].strip():
+                row.pop()
+            while not row[0].strip():
+                del row[0]
+            row[0] = row[0].lstrip()
+            row[-1] = row[-1].rstrip()
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+            values = row if contiguous else [row[i] for i in indices]
+            for i in intern_positions:
+                values[i] = intern(values[i])
+
+            risk_value = values[risk_pos] if risk_pos >= 0 else ""
+            if not risk_value:
+                tasks.append(dict(zip(keys, values)))
+                continue
+
+            # Special handling for risk_tags: split by "/", keeping the
+            # original string right after it
+            task = dict(zip(head_keys, values))
+            task["risk_tags"] = [
+                intern(tag.strip()) for tag in risk_value.split("/") if tag.strip()
+            ]
+            task["risk_tags_original"] = risk_value
+            task.update(zip(tail_keys, values[risk_pos + 1:]))
+            tasks.append(task)
+
+    return tasks
+
+
 def parse_data_file(
     file_path: str, fields: list[FieldMetadata]
 ) -> list[dict]:
@@ -113,36 +189,25 @@ def parse_data_file(
 
     Raises:
         DataFileError: If file cannot be read
+        ParseError: If a row cannot be parsed
     """
-    tasks = []
+    if not Path(file_path).exists():
+        raise DataFileError(f"File not found: {file_path}")
 
-    success, message, lines = safe_read_file(file_path)
-    if not success:
-        raise DataFileError(message)
-
-    for line_num, line in enumerate(lines, start=1):
-        line = line.strip()
-        if not line:  # Skip empty lines
-            continue
-
-        values = line.split("\t")
-
-        # Build task dictionary
-        task = {}
-        for field in fields:
-            value = values[field.index] if field.index < len(values) else ""
-
-            # Special handling for risk_tags: split by "/"
-            if field.key == "risk_tags" and value:
-                # Split by "/" and filter out empty strings
-                tags = [tag.strip() for tag in value.split("/") if tag.strip()]
-                task[field.key] = tags
-                # Also keep the original string
-                task[field.key + "_original"] = value
-            else:
-                task[field.key] = value
-
-        tasks.append(task)
+    try:
+        tasks = _parse_rows(file_path, fields, "utf-8")
+    except UnicodeDecodeError:
+        # Try other encodings
+        try:
+            tasks = _parse_rows(file_path, fields, "gbk")
+        except (UnicodeDecodeError, OSError) as e:
+            raise DataFileError(f"Encoding error: {str(e)}")
+    except PermissionError:
+        raise DataFileError(f"Permission denied, cannot read file: {file_path}")
+    except OSError as e:
+        raise DataFileError(f"Failed to read file: {str(e)}")
+    except csv.Error as e:
+        raise ParseError(f"Failed to parse {file_path}: {str(e)}")
 
     logger.info(f"Parsed {len(tasks)} tasks from {file_path}")
     return tasks
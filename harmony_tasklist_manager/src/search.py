@@ -1,36 +1,344 @@
 """Search functionality for task list."""
 
-import re
+import functools
+import hashlib
 import logging
+import os
+import pickle
+import stat
+import tempfile
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 
 from .models import FieldMetadata
+from .parsers import parse_title_file, parse_data_file
 
 logger = logging.getLogger(__name__)
 
+# Joins field values in a search blob; not expected inside task data
+_BLOB_SEPARATOR = "\x1f"
+# Joins task blobs in a search corpus; not expected inside task data
+_RECORD_SEPARATOR = "\x1e"
+
+
+@dataclass
+class SearchIndex:
+    """
+    Precomputed search text for a task list.
+
+    corpus holds every task's blob (its string values joined by
+    _BLOB_SEPARATOR), one task after another, joined by _RECORD_SEPARATOR;
+    starts[i] is where task i begins. corpus_lower/starts_lower are the
+    same for the lowercased blobs, and fields_lower[i] maps each field of
+    task i to its lowercase value (lists are lowered item by item,
+    non-strings become None).
+    """
+
+    corpus: str
+    starts: list[int]
+    corpus_lower: str
+    starts_lower: list[int]
+    fields_lower: list[dict]
+
+    def candidates(self, needle: str, case_sensitive: bool):
+        """
+        Indexes of the tasks whose blob contains needle, in order.
+
+        The corpus is scanned with str.find, resuming at the next task
+        after each hit, so the Python-level work is per matching task
+        rather than per task.
+        """
+        if _RECORD_SEPARATOR in needle:
+            return range(len(self.fields_lower))
+        corpus, starts = (
+            (self.corpus, self.starts)
+            if case_sensitive
+            else (self.corpus_lower, self.starts_lower)
+        )
+        found = []
+        last = len(starts) - 1
+        pos = corpus.find(needle)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            found.append(i)
+            if i == last:
+                break
+            pos = corpus.find(needle, starts[i + 1])
+        return found
+
+
+def _offsets(blobs: list[str]) -> list[int]:
+    """Start of each blob once joined by _RECORD_SEPARATOR."""
+    starts = []
+    pos = 0
+    for blob in blobs:
+        starts.append(pos)
+        pos += len(blob) + 1
+    return starts
+
+
+def build_search_index(tasks: list[dict]) -> SearchIndex:
+    """Precompute the text searched for each task (see SearchIndex)."""
+    blobs = []
+    blobs_lower = []
+    fields_lower_list = []
+    for task in tasks:
+        parts = []
+        fields_lower = {}
+        for key, value in task.items():
+            if isinstance(value, list):
+                parts.extend(item for item in value if isinstance(item, str))
+                fields_lower[key] = [
+                    item.lower() if isinstance(item, str) else None for item in value
+                ]
+            elif isinstance(value, str):
+                parts.append(value)
+                fields_lower[key] = value.lower()
+        blob = _BLOB_SEPARATOR.join(parts)
+        blobs.append(blob)
+        blobs_lower.append(blob.lower())
+        fields_lower_list.append(fields_lower)
+    return SearchIndex(
+        corpus=_RECORD_SEPARATOR.join(blobs),
+        starts=_offsets(blobs),
+        corpus_lower=_RECORD_SEPARATOR.join(blobs_lower),
+        starts_lower=_offsets(blobs_lower),
+        fields_lower=fields_lower_list,
+    )
+
+
+def _file_signature(path: str) -> Optional[tuple[int, int]]:
+    """(mtime_ns, size) of path, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# Bump when the parser or the task layout changes so older task caches are ignored
+_TASK_CACHE_VERSION = 1
+
+
+def _user_cache_dir(name: str) -> str:
+    """Per-user cache location: $XDG_CACHE_HOME, %LOCALAPPDATA% or ~/.cache."""
+    base = (
+        os.environ.get("XDG_CACHE_HOME")
+        or os.environ.get("LOCALAPPDATA")
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(base, name)
+
+
+def _ensure_private_dir(path: str) -> bool:
+    """
+    Create path with mode 0o700 if missing; True if only this user can write to it.
+
+    A directory owned by someone else, or writable by group or others, is
+    refused so its contents are never unpickled.
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o022):
+        return False
+    return True
+
+
+def _task_cache_path(data_file_path: str) -> str:
+    """Task cache file for a data file, in the per-user cache directory."""
+    key = os.path.realpath(data_file_path).encode("utf-8", errors="surrogatepass")
+    digest = hashlib.blake2b(key, digest_size=16).hexdigest()
+    return os.path.join(_user_cache_dir("harmony_tasklist_manager"), f"{digest}.pkl")
+
+
+def _load_task_cache(data_file_path: str, signatures: tuple) -> Optional[list[dict]]:
+    """Tasks pickled by _save_task_cache, if written for these file signatures."""
+    path = _task_cache_path(data_file_path)
+    if not _ensure_private_dir(os.path.dirname(path)):
+        return None
+    try:
+        with open(path, "rb") as f:
+            cached_key, tasks = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable task cache: {e}")
+        return None
+    return tasks if cached_key == (_TASK_CACHE_VERSION, *signatures) else None
+
+
+def _save_task_cache(data_file_path: str, signatures: tuple, tasks: list[dict]):
+    """Pickle tasks into the per-user cache directory (written atomically)."""
+    path = _task_cache_path(data_file_path)
+    cache_dir = os.path.dirname(path)
+    if not _ensure_private_dir(cache_dir):
+        logger.warning(f"Not writing task cache: {cache_dir} is not private to this user")
+        return
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    except OSError as e:
+        logger.warning(f"Failed to write task cache {path}: {e}")
+        return
+    key = (_TASK_CACHE_VERSION, *signatures)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((key, tasks), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to write task cache {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def build_filter_index(tasks: list[dict]) -> dict[str, dict[str, set[int]]]:
+    """
+    Build inverted indices for equality filters: {field: {str(value): {task positions}}}.
+
+    Values are indexed the way filter_by_conditions compares them: each list
+    item separately, and a missing field as str(None).
+    """
+    index = {key: {} for task in tasks for key in task}
+    for position, task in enumerate(tasks):
+        for key, postings in index.items():
+            value = task.get(key)
+            if isinstance(value, list):
+                for item in value:
+                    postings.setdefault(str(item), set()).add(position)
+            else:
+                postings.setdefault(str(value), set()).add(position)
+    return index
+
+
+@functools.lru_cache(maxsize=256)
+def _highlight(text: str, query: str, case_sensitive: bool) -> str:
+    """Wrap each non-overlapping occurrence of query in text with ** markers."""
+    if case_sensitive:
+        return text.replace(query, f"**{query}**")
+
+    text_lower = text.lower()
+    if len(text_lower) == len(text):
+        starts = range(len(text))
+    else:
+        # Some characters lowercase to several; map lowered offsets back
+        starts = [i for i, ch in enumerate(text) for _ in ch.lower()]
+
+    query_lower = query.lower()
+    parts = []
+    last = 0
+    pos = text_lower.find(query_lower)
+    while pos != -1:
+        end = pos + len(query_lower)
+        start_orig = max(starts[pos], last)
+        end_orig = starts[end - 1] + 1
+        parts.append(text[last:start_orig])
+        parts.append(f"**{text[start_orig:end_orig]}**")
+        last = end_orig
+        pos = text_lower.find(query_lower, end)
+    parts.append(text[last:])
+    return "".join(parts)
+
 
 class DataManager:
     """Data manager with caching and hot reload."""
 
-    def __init__(self, title_file_path: str, data_file_path: str, cache_ttl):
+    def __init__(
+        self,
+        title_file_path: str,
+        data_file_path: str,
+        cache_ttl,
+        persist_cache: bool = False,
+    ):
         self.title_file_path = title_file_path
         self.data_file_path = data_file_path
         self._cache_ttl = cache_ttl
+        # Keep parsed tasks in a per-user pickle cache across restarts
+        self._persist_cache = persist_cache
         self._fields_cache = None
+        self._fields_metadata = None
+        self._field_list = None
+        self._searcher = None
         self._tasks_cache = None
+        self._task_by_id = None
+        self._search_index = None
+        self._stats_cache = {}
+        self._filter_index = None
         self._last_loaded = None
+        self._title_signature = None
+        self._data_signature = None
 
     def get_fields(self):
         """Get field metadata (with caching)."""
         if self._fields_cache is None:
-            from .parsers import parse_title_file
-
+            self._title_signature = _file_signature(self.title_file_path)
             self._fields_cache = parse_title_file(self.title_file_path)
+            self._fields_metadata = None
+            self._field_list = None
+            self._searcher = None
         return self._fields_cache
 
+    def get_searcher(self) -> "TaskSearcher":
+        """Get a TaskSearcher for the current fields (cached with the fields)."""
+        fields = self.get_fields()
+        if self._searcher is None:
+            self._searcher = TaskSearcher(fields)
+        return self._searcher
+
+    def get_fields_metadata(self) -> dict:
+        """Get {key: {name, label, description}} for all fields (cached with the fields)."""
+        fields = self.get_fields()
+        if self._fields_metadata is None:
+            self._fields_metadata = {
+                f.key: {
+                    "name": f.en_name,
+                    "label": f.cn_short_name,
+                    "description": f.cn_full_name,
+                }
+                for f in fields
+            }
+        return self._fields_metadata
+
+    def get_field_list(self) -> list[dict]:
+        """Get field descriptions in column order (cached with the fields)."""
+        fields = self.get_fields()
+        if self._field_list is None:
+            self._field_list = [
+                {
+                    "key": f.key,
+                    "name": f.en_name,
+                    "label": f.cn_short_name,
+                    "description": f.cn_full_name,
+                    "index": f.index,
+                }
+                for f in fields
+            ]
+        return self._field_list
+
+    def _files_unchanged(self) -> bool:
+        """Whether the title and data files still match the cached parse."""
+        title = _file_signature(self.title_file_path)
+        data = _file_signature(self.data_file_path)
+        if title is None or title != self._title_signature:
+            self._fields_cache = None  # Re-read with the data below
+            return False
+        return data is not None and data == self._data_signature
+
     def get_tasks(self, force_reload: bool = False):
-        """Get task list (with caching)."""
+        """
+        Get task list (with caching).
+
+        Once cache_ttl has passed the files are stat'ed, and only reparsed
+        if their modification time or size changed.
+        """
         now = datetime.now()
 
         # Check if cache is expired
@@ -40,19 +348,76 @@ class DataManager:
             or self._last_loaded is None
             or now - self._last_loaded > self._cache_ttl
         ):
-            from .parsers import parse_data_file
+            if not force_reload and self._tasks_cache is not None and self._files_unchanged():
+                self._last_loaded = now
+                return self._tasks_cache
 
             fields = self.get_fields()
-            self._tasks_cache = parse_data_file(self.data_file_path, fields)
+            self._data_signature = _file_signature(self.data_file_path)
+            self._tasks_cache = self._load_tasks(fields)
+            self._task_by_id = None
+            self._stats_cache = {}
             self._last_loaded = now
 
         return self._tasks_cache
 
+    def _load_tasks(self, fields: list[FieldMetadata]) -> list[dict]:
+        """Parse the data file, or load it from the pickle cache if enabled and current."""
+        if not self._persist_cache or self._data_signature is None:
+            return parse_data_file(self.data_file_path, fields)
+
+        signatures = (self._title_signature, self._data_signature)
+        tasks = _load_task_cache(self.data_file_path, signatures)
+        if tasks is None:
+            tasks = parse_data_file(self.data_file_path, fields)
+            _save_task_cache(self.data_file_path, signatures, tasks)
+        return tasks
+
+    def get_task_by_id(self, task_id: str) -> Optional[dict]:
+        """Get a single task by task_id (index built once per data load)."""
+        tasks = self.get_tasks()
+        if self._task_by_id is None:
+            # Reversed so the first task wins when IDs repeat, as with a scan
+            self._task_by_id = {task.get("task_id"): task for task in reversed(tasks)}
+        return self._task_by_id.get(task_id)
+
+    def get_statistics(self, group_by: Optional[str] = None) -> dict:
+        """Get task statistics, computed once per data load and group_by."""
+        tasks = self.get_tasks()
+        stats = self._stats_cache.get(group_by)
+        if stats is None:
+            stats = AdvancedSearcher.get_statistics(tasks, group_by)
+            if len(self._stats_cache) >= 64:
+                self._stats_cache.clear()  # group_by is caller-supplied; stay bounded
+            self._stats_cache[group_by] = stats
+        return stats
+
+    def get_filter_index(self, tasks: list[dict]) -> dict[str, dict[str, set[int]]]:
+        """Get the filter index for a task list returned by get_tasks (cached)."""
+        if self._filter_index is None or self._filter_index[0] is not tasks:
+            self._filter_index = (tasks, build_filter_index(tasks))
+        return self._filter_index[1]
+
+    def get_search_index(self, tasks: list[dict]) -> SearchIndex:
+        """Get the search index for a task list returned by get_tasks (cached)."""
+        if self._search_index is None or self._search_index[0] is not tasks:
+            self._search_index = (tasks, build_search_index(tasks))
+        return self._search_index[1]
+
     def clear_cache(self):
         """Clear cache."""
         self._fields_cache = None
+        self._fields_metadata = None
+        self._field_list = None
+        self._searcher = None
         self._tasks_cache = None
+        self._task_by_id = None
+        self._search_index = None
+        self._stats_cache = {}
+        self._filter_index = None
         self._last_loaded = None
+        self._title_signature = None
+        self._data_signature = None
 
 
 class TaskSearcher:
@@ -68,6 +433,7 @@ class TaskSearcher:
         query: str,
         search_fields: Optional[list[str]] = None,
         case_sensitive: bool = False,
+        index: Optional[SearchIndex] = None,
     ) -> dict:
         """
         Multi-field fuzzy search.
@@ -77,6 +443,8 @@ class TaskSearcher:
             query: Search keyword
             search_fields: Fields to search (None means all fields)
             case_sensitive: Whether to distinguish case
+            index: build_search_index(tasks), reused across searches
+                (built on the fly when omitted)
 
         Returns:
             Search result
@@ -94,20 +462,13 @@ class TaskSearcher:
         # Determine search fields
         fields_to_search = search_fields if search_fields else self.field_keys
 
-        # Compile regex
-        flags = 0 if case_sensitive else re.IGNORECASE
-        try:
-            pattern = re.compile(re.escape(query), flags)
-        except re.error:
-            # If regex fails, use simple substring search
-            pattern = None
-
-        results = []
-        matched_field_set = set()
+        if index is None:
+            index = build_search_index(tasks)
+        needle = query if case_sensitive else query.lower()
 
-        for task in tasks:
+        def highlight_task(task: dict, fields_lower: dict) -> dict:
+            """Highlights per matching field of task (empty when none match)."""
             match_highlights = {}
-            is_match = False
 
             for field_key in fields_to_search:
                 value = task.get(field_key, "")
@@ -117,51 +478,35 @@ class TaskSearcher:
                 # Handle list values (e.g., risk_tags)
                 if isinstance(value, list):
                     # Search within list elements
-                    is_field_match = False
-                    matched_elements = []
-                    for item in value:
-                        if isinstance(item, str):
-                            if pattern:
-                                item_match = pattern.search(item) is not None
-                            else:
-                                if case_sensitive:
-                                    item_match = query in item
-                                else:
-                                    item_match = query.lower() in item.lower()
-
-                            if item_match:
-                                is_field_match = True
-                                matched_elements.append(
-                                    self._highlight_matches(item, query, case_sensitive)
-                                )
-
-                    if is_field_match:
-                        is_match = True
-                        matched_field_set.add(field_key)
+                    texts = value if case_sensitive else fields_lower[field_key]
+                    matched_elements = [
+                        self._highlight_matches(item, query, case_sensitive)
+                        for item, text in zip(value, texts)
+                        if isinstance(item, str) and needle in text
+                    ]
+
+                    if matched_elements:
                         match_highlights[field_key] = matched_elements
                     continue
 
                 # Check match for string values
-                if pattern:
-                    is_field_match = pattern.search(value) is not None
-                else:
-                    if case_sensitive:
-                        is_field_match = query in value
-                    else:
-                        is_field_match = query.lower() in value.lower()
-
-                if is_field_match:
-                    is_match = True
-                    matched_field_set.add(field_key)
+                text = value if case_sensitive else fields_lower.get(field_key, "")
+                if needle in text:
                     # Highlight matches
                     match_highlights[field_key] = self._highlight_matches(
                         value, query, case_sensitive
                     )
 
-            if is_match:
-                task_copy = task.copy()
-                task_copy["_match_highlights"] = match_highlights
-                results.append(task_copy)
+            return match_highlights
+
+        # One scan over the whole corpus rules out most tasks
+        fields_lower = index.fields_lower
+        results = [
+            {**tasks[i], "_match_highlights": highlights}
+            for i in index.candidates(needle, case_sensitive)
+            if (highlights := highlight_task(tasks[i], fields_lower[i]))
+        ]
+        matched_field_set = {key for task in results for key in task["_match_highlights"]}
 
         return {
             "success": True,
@@ -176,12 +521,7 @@ class TaskSearcher:
         self, text: str, query: str, case_sensitive: bool
     ) -> str:
         """Highlight matches in text."""
-        if case_sensitive:
-            return text.replace(query, f"**{query}**")
-        else:
-            # Case-insensitive highlight
-            pattern = re.compile(re.escape(query), re.IGNORECASE)
-            return pattern.sub(lambda m: f"**{m.group()}**", text)
+        return _highlight(text, query, case_sensitive)
 
 
 class AdvancedSearcher:
@@ -189,7 +529,10 @@ class AdvancedSearcher:
 
     @staticmethod
     def filter_by_conditions(
-        tasks: list[dict], filters: dict, match_mode: str = "all"
+        tasks: list[dict],
+        filters: dict,
+        match_mode: str = "all",
+        index: Optional[dict[str, dict[str, set[int]]]] = None,
     ) -> dict:
         """
         Filter tasks by multiple conditions.
@@ -198,8 +541,11 @@ class AdvancedSearcher:
             tasks: Task list
             filters: Filter conditions {field: value}
             match_mode: "all"=all match, "any"=any match
+            index: build_filter_index(tasks); when given, matches come from
+                set operations instead of a scan over every task
         """
-        results = []
+        if index is not None:
+            return AdvancedSearcher._filter_with_index(tasks, filters, match_mode, index)
 
         def value_matches(task_value: any, filter_value: any) -> bool:
             """Check if task value matches filter value."""
@@ -209,21 +555,45 @@ class AdvancedSearcher:
             # Handle string/other values
             return str(task_value) == str(filter_value)
 
-        for task in tasks:
-            if match_mode == "all":
-                # All conditions must be satisfied
-                if all(
-                    value_matches(task.get(field), value)
-                    for field, value in filters.items()
-                ):
-                    results.append(task)
-            else:  # "any"
-                # Any condition satisfied
-                if any(
-                    value_matches(task.get(field), value)
-                    for field, value in filters.items()
-                ):
-                    results.append(task)
+        combine = all if match_mode == "all" else any  # "any": any condition satisfied
+        conditions = filters.items()
+        results = [
+            task
+            for task in tasks
+            if combine(value_matches(task.get(field), value) for field, value in conditions)
+        ]
+
+        return {
+            "success": True,
+            "filters": filters,
+            "match_mode": match_mode,
+            "total_matches": len(results),
+            "tasks": results,
+        }
+
+    @staticmethod
+    def _filter_with_index(
+        tasks: list[dict],
+        filters: dict,
+        match_mode: str,
+        index: dict[str, dict[str, set[int]]],
+    ) -> dict:
+        """filter_by_conditions over an inverted index (same results and order)."""
+        all_positions = range(len(tasks))
+        matches = []
+        for field, value in filters.items():
+            postings = index.get(field)
+            if postings is None:
+                # No task has this field, so every task compares as str(None)
+                matches.append(set(all_positions) if str(value) == "None" else set())
+            else:
+                matches.append(postings.get(str(value), set()))
+
+        if match_mode == "all":
+            positions = set.intersection(*matches) if matches else all_positions
+        else:  # "any"
+            positions = set().union(*matches)
+        results = [tasks[i] for i in sorted(positions)]
 
         return {
             "success": True,
@@ -233,6 +603,11 @@ class AdvancedSearcher:
             "tasks": results,
         }
 
+    @staticmethod
+    def _count_values(tasks: list[dict], key: str) -> dict:
+        """Count tasks per value of key, in first-seen order; blanks count as "(empty)"."""
+        return dict(Counter(task.get(key, "") or "(empty)" for task in tasks))
+
     @staticmethod
     def get_statistics(tasks: list[dict], group_by: Optional[str] = None) -> dict:
         """Get task statistics."""
@@ -241,25 +616,17 @@ class AdvancedSearcher:
 
         if group_by:
             # Group by field
-            group_counts = {}
-            for task in tasks:
-                value = task.get(group_by, "") or "(empty)"
-                group_counts[value] = group_counts.get(value, 0) + 1
-            stats[f"by_{group_by}"] = group_counts
+            stats[f"by_{group_by}"] = AdvancedSearcher._count_values(tasks, group_by)
 
         # Default statistics for common fields
         # Risk detection result
-        detection_counts = {}
-        for task in tasks:
-            value = task.get("auto_detection_result", "") or "(empty)"
-            detection_counts[value] = detection_counts.get(value, 0) + 1
-        stats["by_detection_result"] = detection_counts
+        stats["by_detection_result"] = AdvancedSearcher._count_values(
+            tasks, "auto_detection_result"
+        )
 
         # Manual conclusion
-        conclusion_counts = {}
-        for task in tasks:
-            value = task.get("manual_analysis_conclusion", "") or "(empty)"
-            conclusion_counts[value] = conclusion_counts.get(value, 0) + 1
-        stats["by_manual_conclusion"] = conclusion_counts
+        stats["by_manual_conclusion"] = AdvancedSearcher._count_values(
+            tasks, "manual_analysis_conclusion"
+        )
 
         return {"success": True, "statistics": stats}
@@ -0,0 +1,127 @@
+"""Stdio transport for the MCP server with a bounded message buffer."""
+
+import os
+import stat
+import sys
+from contextlib import asynccontextmanager
+from io import TextIOWrapper
+
+import anyio
+import anyio.lowlevel
+import mcp.types as types
+
+try:
+    from mcp.shared.message import SessionMessage
+except ImportError:  # Older SDKs exchange bare JSONRPCMessage objects
+    SessionMessage = None
+
+# Messages buffered in each direction between the stdio tasks and the server
+DEFAULT_BUFFER_SIZE = 64
+
+
+def get_buffer_size() -> int:
+    """Buffer size from HARMONY_MCP_BUFFER (default: DEFAULT_BUFFER_SIZE)."""
+    try:
+        size = int(os.getenv("HARMONY_MCP_BUFFER", DEFAULT_BUFFER_SIZE))
+    except ValueError:
+        return DEFAULT_BUFFER_SIZE
+    return max(size, 0)
+
+
+def _nonblocking_stdout() -> "int | None":
+    """
+    Switch stdout to non-blocking mode if it is a pipe; return its fd.
+
+    Returns None (keep the threaded file writes) for terminals and files,
+    whose file description may be shared with the parent shell, and on
+    platforms that cannot make a pipe non-blocking.
+    """
+    try:
+        fd = sys.stdout.fileno()
+        if not stat.S_ISFIFO(os.fstat(fd).st_mode):
+            return None
+        sys.stdout.flush()
+        os.set_blocking(fd, False)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return fd
+
+
+async def _write_all(fd: int, data: bytes):
+    """Write data to a non-blocking fd, yielding to the event loop while the pipe is full."""
+    view = memoryview(data)
+    while view:
+        try:
+            written = os.write(fd, view)
+        except BlockingIOError:
+            await anyio.sleep(0.005)
+            continue
+        view = view[written:]
+        if view:
+            await anyio.lowlevel.checkpoint()
+
+
+@asynccontextmanager
+async def stdio_server(buffer_size: int = DEFAULT_BUFFER_SIZE):
+    """
+    Serve MCP over stdin/stdout, like mcp.server.stdio.stdio_server.
+
+    The SDK hands each message over with no buffer, so reading stalls
+    whenever the server is busy. Here up to buffer_size messages queue in
+    each direction: input is parsed ahead while a slow tool runs, and a
+    burst still blocks the reader once the buffer is full, keeping memory
+    bounded.
+
+    When stdout is a pipe it is written directly with non-blocking
+    os.write calls, so a response larger than the pipe buffer drains
+    without tying up a worker thread or stalling other tool calls.
+    """
+    stdin = anyio.wrap_file(
+        TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")
+    )
+    stdout = anyio.wrap_file(TextIOWrapper(sys.stdout.buffer, encoding="utf-8"))
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(buffer_size)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(buffer_size)
+
+    async def stdin_reader():
+        try:
+            async with read_stream_writer:
+                async for line in stdin:
+                    try:
+                        message = types.JSONRPCMessage.model_validate_json(line)
+                    except Exception as exc:
+                        await read_stream_writer.send(exc)
+                        continue
+
+                    if SessionMessage is not None:
+                        message = SessionMessage(message)
+                    await read_stream_writer.send(message)
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    stdout_fd = _nonblocking_stdout()
+
+    async def stdout_writer():
+        try:
+            async with write_stream_reader:
+                async for message in write_stream_reader:
+                    if SessionMessage is not None:
+                        message = message.message
+                    json = message.model_dump_json(by_alias=True, exclude_none=True)
+                    if stdout_fd is not None:
+                        await _write_all(stdout_fd, (json + "\n").encode("utf-8"))
+                    else:
+                        await stdout.write(json + "\n")
+                        await stdout.flush()
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(stdin_reader)
+            tg.start_soon(stdout_writer)
+            yield read_stream, write_stream
+    finally:
+        if stdout_fd is not None:
+            os.set_blocking(stdout_fd, True)
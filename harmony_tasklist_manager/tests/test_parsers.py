@@ -0,0 +1,76 @@
+"""Tests for the title and data file parsers."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.parsers import parse_data_file, parse_title_file
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+KEYS = ["responsible_person", "app_name", "package_name", "issue_description", "risk_tags"]
+
+
+def _fields(tmp_path):
+    title_file = tmp_path / "title.txt"
+    title_file.write_text(
+        "\t".join(KEYS) + "\n" + "\t".join(["全称"] * len(KEYS)) + "\n"
+        + "\t".join(["简称"] * len(KEYS)) + "\n",
+        encoding="utf-8",
+    )
+    return parse_title_file(str(title_file))
+
+
+def _split_parse(file_path, fields):
+    """Reference parse: strip each line and split it on tabs, as before csv.reader."""
+    tasks = []
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            values = line.split("\t")
+            task = {}
+            for field in fields:
+                value = values[field.index] if field.index < len(values) else ""
+                if field.key == "risk_tags" and value:
+                    task[field.key] = [tag.strip() for tag in value.split("/") if tag.strip()]
+                    task[field.key + "_original"] = value
+                else:
+                    task[field.key] = value
+            tasks.append(task)
+    return tasks
+
+
+def test_parse_fixture():
+    fields = parse_title_file(os.path.join(FIXTURES, "title.txt"))
+    tasks = parse_data_file(os.path.join(FIXTURES, "tasklist.txt"), fields)
+    assert len(tasks) == 5
+    assert tasks[0]["Column8"] == "TaskID1"
+
+
+def test_matches_split_parse(tmp_path):
+    fields = _fields(tmp_path)
+    data_file = tmp_path / "tasklist.txt"
+    data_file.write_text(
+        "\n"
+        "  UserA\tApp \"quoted\tcom.a\n"
+        "\tUserB\tAppB\tcom.b\t\tROOT/短信\t\n"
+        "   \n"
+        "UserC\t'x\tcom.c\tdesc \\ slash\t/A//B/\n",
+        encoding="utf-8",
+    )
+    tasks = parse_data_file(str(data_file), fields)
+    assert tasks == _split_parse(str(data_file), fields)
+
+
+def test_field_over_csv_default_limit(tmp_path):
+    fields = _fields(tmp_path)
+    description = "x" * 200_000
+    data_file = tmp_path / "tasklist.txt"
+    data_file.write_text(f"UserA\tAppA\tcom.a\t{description}\tROOT\n", encoding="utf-8")
+    tasks = parse_data_file(str(data_file), fields)
+    assert len(tasks) == 1
+    assert tasks[0]["issue_description"] == description
+    assert tasks[0]["risk_tags"] == ["ROOT"]
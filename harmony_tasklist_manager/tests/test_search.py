@@ -0,0 +1,109 @@
+"""Tests for the filter and search indexes against a scan over every task."""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models import FieldMetadata
+from src.search import (
+    AdvancedSearcher,
+    TaskSearcher,
+    build_filter_index,
+    build_search_index,
+)
+
+KEYS = ["app_name", "status", "priority", "risk_tags"]
+VALUES = ["Alpha", "alpha", "Beta", "", "None", "İstanbul", "1"]
+
+
+def _tasks(seed, count=150):
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(count):
+        task = {"task_id": str(i + 1)}
+        for key in KEYS:
+            if rng.random() < 0.15:
+                continue  # missing field
+            if key == "risk_tags":
+                task[key] = rng.sample(VALUES, rng.randint(0, 3))
+            elif key == "priority" and rng.random() < 0.3:
+                task[key] = rng.randint(0, 2)  # non-string value
+            else:
+                task[key] = rng.choice(VALUES)
+        tasks.append(task)
+    return tasks
+
+
+def _filter_scan(tasks, filters, match_mode):
+    """Reference filter: compare each task's values as strings."""
+
+    def value_matches(task_value, filter_value):
+        if isinstance(task_value, list):
+            return str(filter_value) in [str(v) for v in task_value]
+        return str(task_value) == str(filter_value)
+
+    combine = all if match_mode == "all" else any
+    return [
+        task
+        for task in tasks
+        if combine(value_matches(task.get(field), value) for field, value in filters.items())
+    ]
+
+
+FILTERS = [
+    {},
+    {"status": "Alpha"},
+    {"status": "None"},
+    {"status": None},
+    {"priority": 1},
+    {"priority": "1"},
+    {"risk_tags": "Beta"},
+    {"risk_tags": "Beta", "status": "alpha"},
+    {"app_name": "Alpha", "priority": 2, "risk_tags": "1"},
+    {"missing_field": "None"},
+    {"missing_field": "x", "status": "Beta"},
+]
+
+
+@pytest.mark.parametrize("match_mode", ["all", "any"])
+@pytest.mark.parametrize("filters", FILTERS)
+def test_filter_index_matches_scan(filters, match_mode):
+    tasks = _tasks(len(filters))
+    index = build_filter_index(tasks)
+    result = AdvancedSearcher.filter_by_conditions(tasks, filters, match_mode, index=index)
+    expected = _filter_scan(tasks, filters, match_mode)
+    assert result["tasks"] == expected
+    assert result["total_matches"] == len(expected)
+    assert result == AdvancedSearcher.filter_by_conditions(tasks, filters, match_mode)
+
+
+@pytest.mark.parametrize("case_sensitive", [False, True])
+@pytest.mark.parametrize("query", ["alpha", "Alpha", "a", "i̇", "None", "1", "\x1f", "\x1e", "zzz"])
+def test_search_index_matches_scan(query, case_sensitive):
+    # Parsed task values are strings or lists of strings
+    tasks = [
+        {key: value if isinstance(value, list) else str(value) for key, value in task.items()}
+        for task in _tasks(1)
+    ]
+    fields = [FieldMetadata(key, key, key, key, i) for i, key in enumerate(KEYS)]
+    searcher = TaskSearcher(fields)
+    result = searcher.search(
+        tasks, query, case_sensitive=case_sensitive, index=build_search_index(tasks)
+    )
+
+    def contains(value):
+        return query in value if case_sensitive else query.lower() in value.lower()
+
+    expected = [
+        task["task_id"]
+        for task in tasks
+        if any(
+            any(contains(item) for item in value) if isinstance(value, list) else contains(value)
+            for value in (task.get(key, "") for key in KEYS)
+        )
+    ]
+    assert [task["task_id"] for task in result["tasks"]] == expected
@@ -6,10 +6,15 @@ knowledge-manager MCP Server
 使用官方 MCP SDK 实现 stdio 协议。
 """
 import asyncio
+import heapq
 import json
 import logging
+import mmap
 import os
+import threading
+from bisect import bisect_right
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -17,6 +22,11 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import orjson
+except ImportError:  # 可选加速，未安装时使用标准库 json
+    orjson = None
+
 # 添加项目根目录到路径
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -33,6 +43,145 @@ server = Server("knowledge-manager")
 _knowledge_dir: str = None
 _experiences: list[dict] = []
 _knowledge_base: list[dict] = []
+_experience_index: "_TextIndex" = None
+_knowledge_index: "_TextIndex" = None
+# 已加载文件的 (mtime_ns, size)，未变化的文件不再重新解析
+_file_sig: dict[str, tuple[int, int]] = {}
+
+# 新增经验先逐条追加到日志文件（每行一条 JSON），累计 _COMPACT_EVERY 条后再合并进 experiences.json
+_EXPERIENCE_LOG = "experiences.jsonl"
+_COMPACT_EVERY = 50
+_log_lock = threading.Lock()
+_log_entries = 0
+
+# 拼接字段 / 相邻条目时使用的分隔符，正常文本中不会出现
+_FIELD_SEPARATOR = "\x1f"
+_ENTRY_SEPARATOR = "\x1e"
+
+
+class _TextIndex:
+    """条目指定字段的小写缓存 + 拼接后的小写全文（子串匹配语义不变）
+
+    corpus 由各条目的小写字段依次拼接而成，starts[i] 为第 i 个条目的起始位置。
+    查询时用 str.find 在 corpus 上整体扫描，Python 层只处理命中的条目。
+    """
+
+    def __init__(self, entries: list[dict], fields: tuple[str, ...]):
+        self.entries = entries
+        self.fields = fields
+        self.lowered: list[dict] = []
+        self.starts: list[int] = []
+        # 含 tags 字段时，各条目原始标签的集合（字符串已驻留）
+        self.tag_sets: list[frozenset[str]] = []
+        self.corpus = ""
+        # (query, weights) -> score() 结果，条目变化时清空
+        self._scores: dict[tuple, list[tuple[int, int]]] = {}
+        self.sync()
+
+    def sync(self):
+        """索引 entries 中新追加的条目"""
+        indexed = bool(self.lowered)
+        pos = len(self.corpus) + 1 if indexed else 0
+        blobs = []
+        for entry in self.entries[len(self.lowered):]:
+            lowered = {}
+            texts = []
+            for field in self.fields:
+                value = entry.get(field, [] if field == "tags" else "")
+                if isinstance(value, list):
+                    lowered[field] = [item.lower() for item in value]
+                    texts.extend(lowered[field])
+                else:
+                    lowered[field] = value.lower()
+                    texts.append(lowered[field])
+            blob = _FIELD_SEPARATOR.join(texts)
+            self.lowered.append(lowered)
+            if "tags" in self.fields:
+                self.tag_sets.append(frozenset(map(sys.intern, entry.get("tags", []))))
+            self.starts.append(pos)
+            blobs.append(blob)
+            pos += len(blob) + 1
+        if blobs:
+            self.corpus = _ENTRY_SEPARATOR.join([self.corpus, *blobs] if indexed else blobs)
+            self._scores.clear()
+
+    def candidates(self, query: str):
+        """可能包含（已小写的）query 的条目下标，按原顺序"""
+        if not query or _ENTRY_SEPARATOR in query:
+            return range(len(self.lowered))
+        found = []
+        last = len(self.starts) - 1
+        pos = self.corpus.find(query)
+        while pos != -1:
+            i = bisect_right(self.starts, pos) - 1
+            found.append(i)
+            if i == last:
+                break
+            # 跳到下一个条目继续查找
+            pos = self.corpus.find(query, self.starts[i + 1])
+        return found
+
+    def score(self, query: str, weights: tuple[tuple[str, int], ...]) -> list[tuple[int, int]]:
+        """按权重为包含（已小写的）query 的条目打分，返回得分大于 0 的 (得分, 下标)，按原顺序
+
+        weights 为 ((字段, 权重), ...)；字符串字段包含 query 即得分，列表字段按命中的元素个数计分。
+        相同查询的结果会被缓存，直到条目发生变化。
+        """
+        key = (query, weights)
+        matches = self._scores.get(key)
+        if matches is None:
+            matches = []
+            lowered = self.lowered
+            for pos in self.candidates(query):
+                fields = lowered[pos]
+                score = 0
+                for field, weight in weights:
+                    value = fields[field]
+                    if isinstance(value, list):
+                        score += weight * sum(query in item for item in value)
+                    elif query in value:
+                        score += weight
+                if score > 0:
+                    matches.append((score, pos))
+            if len(self._scores) >= 256:
+                self._scores.clear()
+            self._scores[key] = matches
+        return matches
+
+
+# 各搜索的 (字段, 权重)
+_EXPERIENCE_WEIGHTS = (("title", 10), ("content", 5), ("tags", 3))
+_SIMILAR_CASE_WEIGHTS = (("content", 5), ("title", 3))
+_KNOWLEDGE_WEIGHTS = (("title", 10), ("description", 5), ("content", 3))
+
+
+def _top_matches(
+    entries: list[dict], matches: list[tuple[int, int]], limit: int, score_key: str
+) -> list[dict]:
+    """按得分降序取前 limit 个 (score, 下标) 匹配（同分保持原顺序），只为入选条目附加得分"""
+    if limit >= 0:
+        winners = heapq.nlargest(limit, matches, key=itemgetter(0))
+    else:  # 与切片语义保持一致
+        winners = sorted(matches, key=itemgetter(0), reverse=True)[:limit]
+    return [{**entries[pos], score_key: score} for score, pos in winners]
+
+
+def _get_experience_index() -> _TextIndex:
+    """获取经验索引（数据重新加载后重建，新增经验增量索引）"""
+    global _experience_index
+    if _experience_index is None or _experience_index.entries is not _experiences:
+        _experience_index = _TextIndex(_experiences, ("title", "content", "tags"))
+    else:
+        _experience_index.sync()
+    return _experience_index
+
+
+def _get_knowledge_index() -> _TextIndex:
+    """获取知识库索引（数据重新加载后重建）"""
+    global _knowledge_index
+    if _knowledge_index is None or _knowledge_index.entries is not _knowledge_base:
+        _knowledge_index = _TextIndex(_knowledge_base, ("title", "description", "content"))
+    return _knowledge_index
 
 
 def get_knowledge_dir() -> str:
@@ -45,37 +194,187 @@ def get_knowledge_dir() -> str:
     return _knowledge_dir
 
 
-def load_knowledge():
-    """加载知识库"""
-    global _experiences, _knowledge_base
+def _load_json_file(path: str):
+    """读取并解析 JSON 文件
 
-    experiences_file = os.path.join(get_knowledge_dir(), "experiences.json")
-    if os.path.exists(experiences_file):
-        try:
-            with open(experiences_file, 'r', encoding='utf-8') as f:
-                _experiences = json.load(f)
-            logger.info(f"Loaded {len(_experiences)} experiences")
-        except Exception as e:
-            logger.error(f"Failed to load experiences: {e}")
+    安装 orjson 时直接解析内存映射的文件内容，不再额外复制一份文件数据。
+    """
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            # 空文件无法映射，按原方式解析（并报错）
+            return json.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def _read_experience_log(path: str) -> list[dict]:
+    """读取经验日志，忽略无法解析的行（如写入中断的最后一行）"""
+    entries = []
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(orjson.loads(line) if orjson is not None else json.loads(line))
+                except ValueError as e:
+                    logger.warning(f"Skipping invalid line in {path}: {e}")
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """序列化为 JSON 文本（优先使用 orjson），保留非 ASCII 字符
+
+    工具响应由程序解析，默认紧凑输出；indent 仅用于写入 experiences.json。
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _file_signature(path: str) -> tuple[int, int] | None:
+    """文件的 (mtime_ns, size)，文件不存在时返回 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _signature_changed(path: str) -> bool:
+    """文件存在且自上次加载后有变化（不记录新的签名）"""
+    signature = _file_signature(path)
+    return signature is not None and _file_sig.get(path) != signature
 
+
+def _file_changed(path: str) -> bool:
+    """文件存在且自上次加载后有变化（同时记录新的签名）"""
+    signature = _file_signature(path)
+    if signature is None or _file_sig.get(path) == signature:
+        return False
+    _file_sig[path] = signature
+    return True
+
+
+async def _in_thread(changed: bool, func, *args):
+    """文件有变化时在工作线程中执行 func(*args)，否则返回 None"""
+    if not changed:
+        return None
+    return await asyncio.to_thread(func, *args)
+
+
+async def load_knowledge():
+    """加载知识库（仅重新解析有变化的文件，两个文件在工作线程中同时读取）"""
+    global _knowledge_base
+
+    experiences_file = os.path.join(get_knowledge_dir(), "experiences.json")
+    log_file = os.path.join(get_knowledge_dir(), _EXPERIENCE_LOG)
     knowledge_file = os.path.join(get_knowledge_dir(), "knowledge_base.json")
-    if os.path.exists(knowledge_file):
-        try:
-            with open(knowledge_file, 'r', encoding='utf-8') as f:
-                _knowledge_base = json.load(f)
-            logger.info(f"Loaded {len(_knowledge_base)} knowledge entries")
-        except Exception as e:
-            logger.error(f"Failed to load knowledge base: {e}")
+    # 经验文件在 _reload_experiences 中持锁复查并记录签名，这里只做预判
+    experiences_changed = _signature_changed(experiences_file) or _signature_changed(log_file)
+    knowledge_changed = _file_changed(knowledge_file)
+    if not (experiences_changed or knowledge_changed):
+        return
+
+    loaded, knowledge = await asyncio.gather(
+        _in_thread(experiences_changed, _reload_experiences, experiences_file, log_file),
+        _in_thread(knowledge_changed, _load_json_file, knowledge_file),
+        return_exceptions=True,
+    )
+
+    if isinstance(loaded, Exception):
+        logger.error(f"Failed to load experiences: {loaded}")
+    elif loaded is not None:
+        logger.info(f"Loaded {loaded} experiences")
+
+    if isinstance(knowledge, Exception):
+        logger.error(f"Failed to load knowledge base: {knowledge}")
+    elif knowledge is not None:
+        _knowledge_base = knowledge
+        logger.info(f"Loaded {len(_knowledge_base)} knowledge entries")
+
+
+def _reload_experiences(experiences_file: str, log_file: str) -> int | None:
+    """重新加载有变化的经验文件，返回加载的条数；文件未变化时返回 None（在工作线程中执行）
+
+    全程持有 _log_lock：与新增经验及合并互斥，既不会读到合并了一半的文件，
+    新增的经验也不会追加到即将被替换的旧列表中。
+    """
+    global _experiences
+    with _log_lock:
+        # 两个文件的签名都要更新，不能短路
+        if not (_file_changed(experiences_file) | _file_changed(log_file)):
+            return None
+        _experiences = _load_experiences(experiences_file, log_file)
+        return len(_experiences)
+
+
+def _load_experiences(experiences_file: str, log_file: str) -> list[dict]:
+    """加载 experiences.json 及尚未合并的经验日志（调用方需持有 _log_lock）"""
+    global _log_entries
+    experiences = _load_json_file(experiences_file) if os.path.exists(experiences_file) else []
+    logged = _read_experience_log(log_file)
+    if logged and experiences[-len(logged):] == logged:
+        # 上次合并在删除日志前中断，日志内容已在 experiences.json 中
+        os.remove(log_file)
+        _file_sig.pop(log_file, None)
+        logged = []
+    _log_entries = len(logged)
+    return experiences + logged
 
 
 def save_experiences():
-    """保存经验到文件"""
+    """保存全部经验到 experiences.json 并清空经验日志"""
+    global _log_entries
     experiences_file = os.path.join(get_knowledge_dir(), "experiences.json")
-    try:
-        with open(experiences_file, 'w', encoding='utf-8') as f:
-            json.dump(_experiences, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        logger.error(f"Failed to save experiences: {e}")
+    log_file = os.path.join(get_knowledge_dir(), _EXPERIENCE_LOG)
+    tmp_file = experiences_file + ".tmp"
+    with _log_lock:
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(_dumps(_experiences, indent=True))
+            os.replace(tmp_file, experiences_file)
+            if os.path.exists(log_file):
+                os.remove(log_file)
+            _log_entries = 0
+            # 内存中已是最新数据，无需因自身写入而重新加载
+            _file_sig[experiences_file] = _file_signature(experiences_file)
+            _file_sig.pop(log_file, None)
+        except Exception as e:
+            logger.error(f"Failed to save experiences: {e}")
+
+
+def _append_experience(experience: dict):
+    """新增一条经验：写入内存并追加到经验日志，累计 _COMPACT_EVERY 条后合并（在工作线程中执行）"""
+    global _log_entries
+    log_file = os.path.join(get_knowledge_dir(), _EXPERIENCE_LOG)
+    with _log_lock:
+        _experiences.append(experience)
+        try:
+            with open(log_file, 'a+b') as f:
+                record = _dumps(experience).encode('utf-8') + b"\n"
+                size = f.seek(0, os.SEEK_END)
+                if size:
+                    # 上次写入中断时先补上换行，避免新记录与残缺行粘在一起
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n":
+                        record = b"\n" + record
+                f.write(record)
+            _file_sig[log_file] = _file_signature(log_file)
+            _log_entries += 1
+        except Exception as e:
+            logger.error(f"Failed to save experience: {e}")
+            return
+        compact = _log_entries >= _COMPACT_EVERY
+    if compact:
+        save_experiences()
 
 
 @server.list_tools()
@@ -154,7 +453,7 @@ async def list_tools() -> list[Tool]:
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """处理工具调用"""
-    load_knowledge()
+    await load_knowledge()
 
     try:
         if name == "search_experience":
@@ -168,10 +467,10 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         elif name == "list_experiences":
             return await _list_experiences(arguments)
         else:
-            return [TextContent(type="text", text=json.dumps({"error": f"Unknown tool: {name}"}, ensure_ascii=False))]
+            return [TextContent(type="text", text=_dumps({"error": f"Unknown tool: {name}"}))]
     except Exception as e:
         logger.error(f"Tool {name} error: {e}")
-        return [TextContent(type="text", text=json.dumps({"error": str(e)}, ensure_ascii=False))]
+        return [TextContent(type="text", text=_dumps({"error": str(e)}))]
 
 
 async def _search_experience(args: dict) -> list[TextContent]:
@@ -179,23 +478,10 @@ async def _search_experience(args: dict) -> list[TextContent]:
     query = args["query"].lower()
     top_k = args.get("top_k", 5)
 
-    results = []
-    for exp in _experiences:
-        score = 0
-        if query in exp.get("title", "").lower():
-            score += 10
-        if query in exp.get("content", "").lower():
-            score += 5
-        for tag in exp.get("tags", []):
-            if query in tag.lower():
-                score += 3
-
-        if score > 0:
-            results.append({**exp, "relevance_score": score})
-
-    results.sort(key=lambda x: x["relevance_score"], reverse=True)
+    matches = _get_experience_index().score(query, _EXPERIENCE_WEIGHTS)
 
-    return [TextContent(type="text", text=json.dumps(results[:top_k], ensure_ascii=False, indent=2))]
+    results = _top_matches(_experiences, matches, top_k, "relevance_score")
+    return [TextContent(type="text", text=_dumps(results))]
 
 
 async def _save_experience(args: dict) -> list[TextContent]:
@@ -216,10 +502,9 @@ async def _save_experience(args: dict) -> list[TextContent]:
         "created_at": datetime.now().isoformat()
     }
 
-    _experiences.append(experience)
-    save_experiences()
+    await asyncio.to_thread(_append_experience, experience)
 
-    return [TextContent(type="text", text=json.dumps({"success": True, "experience_id": experience["id"]}, ensure_ascii=False))]
+    return [TextContent(type="text", text=_dumps({"success": True, "experience_id": experience["id"]}))]
 
 
 async def _get_similar_cases(args: dict) -> list[TextContent]:
@@ -228,26 +513,23 @@ async def _get_similar_cases(args: dict) -> list[TextContent]:
     behavior_pattern = args.get("behavior_pattern", "")
     limit = args.get("limit", 5)
 
-    results = []
-    for exp in _experiences:
-        score = 0
+    matches = []
+    if behavior_pattern:
+        matches = _get_experience_index().score(behavior_pattern.lower(), _SIMILAR_CASE_WEIGHTS)
 
-        if malware_family and exp.get("malware_family") == malware_family:
-            score += 10
+    if malware_family:
+        # 同家族的经验另加 10 分
+        pattern_scores = {pos: score for score, pos in matches}
+        matches = []
+        for pos, exp in enumerate(_experiences):
+            score = pattern_scores.get(pos, 0)
+            if exp.get("malware_family") == malware_family:
+                score += 10
+            if score > 0:
+                matches.append((score, pos))
 
-        if behavior_pattern:
-            pattern_lower = behavior_pattern.lower()
-            if pattern_lower in exp.get("content", "").lower():
-                score += 5
-            if pattern_lower in exp.get("title", "").lower():
-                score += 3
-
-        if score > 0:
-            results.append({**exp, "similarity_score": score})
-
-    results.sort(key=lambda x: x["similarity_score"], reverse=True)
-
-    return [TextContent(type="text", text=json.dumps(results[:limit], ensure_ascii=False, indent=2))]
+    results = _top_matches(_experiences, matches, limit, "similarity_score")
+    return [TextContent(type="text", text=_dumps(results))]
 
 
 async def _search_knowledge(args: dict) -> list[TextContent]:
@@ -255,26 +537,15 @@ async def _search_knowledge(args: dict) -> list[TextContent]:
     query = args["query"].lower()
     category = args.get("category", "all")
 
-    results = []
-
-    for entry in _knowledge_base:
-        if category != "all" and entry.get("category") != category:
-            continue
-
-        score = 0
-        if query in entry.get("title", "").lower():
-            score += 10
-        if query in entry.get("description", "").lower():
-            score += 5
-        if query in entry.get("content", "").lower():
-            score += 3
-
-        if score > 0:
-            results.append({**entry, "relevance_score": score})
-
-    results.sort(key=lambda x: x["relevance_score"], reverse=True)
+    matches = _get_knowledge_index().score(query, _KNOWLEDGE_WEIGHTS)
+    if category != "all":
+        matches = [
+            (score, pos) for score, pos in matches
+            if _knowledge_base[pos].get("category") == category
+        ]
 
-    return [TextContent(type="text", text=json.dumps(results[:20], ensure_ascii=False, indent=2))]
+    results = _top_matches(_knowledge_base, matches, 20, "relevance_score")
+    return [TextContent(type="text", text=_dumps(results))]
 
 
 async def _list_experiences(args: dict) -> list[TextContent]:
@@ -285,26 +556,32 @@ async def _list_experiences(args: dict) -> list[TextContent]:
     results = _experiences
 
     if tags_filter:
+        wanted = frozenset(tags_filter)
+        tag_sets = _get_experience_index().tag_sets
         results = [
-            exp for exp in _experiences
-            if any(tag in exp.get("tags", []) for tag in tags_filter)
+            exp for exp, tags in zip(_experiences, tag_sets)
+            if not wanted.isdisjoint(tags)
         ]
 
-    return [TextContent(type="text", text=json.dumps(results[:limit], ensure_ascii=False, indent=2))]
+    return [TextContent(type="text", text=_dumps(results[:limit]))]
 
 
 async def main():
     """启动 knowledge-manager MCP Server"""
     logger.info("Starting knowledge-manager MCP server")
-    load_knowledge()
+    await load_knowledge()
     logger.info(f"Knowledge loaded: {len(_experiences)} experiences, {len(_knowledge_base)} knowledge items")
 
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+    finally:
+        if _log_entries:
+            save_experiences()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+"""
+经验日志的追加、合并与恢复测试
+
+knowledge_manager 作为 mcp_servers 包的子包运行，缺少该包时跳过。
+"""
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+km = pytest.importorskip("mcp_servers.knowledge_manager")
+
+
+@pytest.fixture
+def knowledge_dir(tmp_path, monkeypatch):
+    """使用临时知识目录，并重置模块内的全局状态"""
+    monkeypatch.setattr(km, "_knowledge_dir", str(tmp_path))
+    monkeypatch.setattr(km, "_experiences", [])
+    monkeypatch.setattr(km, "_experience_index", None)
+    monkeypatch.setattr(km, "_file_sig", {})
+    monkeypatch.setattr(km, "_log_entries", 0)
+    monkeypatch.setattr(km, "_COMPACT_EVERY", 3)
+    return tmp_path
+
+
+def _experience(i: int) -> dict:
+    return {"id": f"EXP_{i}", "title": f"title {i}", "content": f"content {i}", "tags": []}
+
+
+def _ids(experiences: list[dict]) -> list[str]:
+    return [e["id"] for e in experiences]
+
+
+def _read_json(path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _reload():
+    """丢弃已记录的文件签名后重新加载"""
+    km._file_sig.clear()
+    asyncio.run(km.load_knowledge())
+
+
+def test_append_then_compact(knowledge_dir):
+    log_file = knowledge_dir / km._EXPERIENCE_LOG
+    experiences_file = knowledge_dir / "experiences.json"
+
+    km._append_experience(_experience(0))
+    km._append_experience(_experience(1))
+    assert len(log_file.read_bytes().splitlines()) == 2
+    assert not experiences_file.exists()
+
+    km._append_experience(_experience(2))
+    assert not log_file.exists()
+    assert _ids(_read_json(experiences_file)) == ["EXP_0", "EXP_1", "EXP_2"]
+
+    km._append_experience(_experience(3))
+    _reload()
+    assert _ids(km._experiences) == ["EXP_0", "EXP_1", "EXP_2", "EXP_3"]
+    assert km._log_entries == 1
+
+
+def test_recover_interrupted_compaction(knowledge_dir):
+    """合并写入 experiences.json 后、删除日志前中断：重新加载时不重复"""
+    experiences = [_experience(i) for i in range(3)]
+    (knowledge_dir / "experiences.json").write_text(json.dumps(experiences), encoding="utf-8")
+    log_file = knowledge_dir / km._EXPERIENCE_LOG
+    log_file.write_text("".join(json.dumps(e) + "\n" for e in experiences[1:]), encoding="utf-8")
+
+    _reload()
+    assert _ids(km._experiences) == ["EXP_0", "EXP_1", "EXP_2"]
+    assert not log_file.exists()
+    assert km._log_entries == 0
+
+
+def test_recover_torn_log_line(knowledge_dir):
+    """日志最后一行写入中断：跳过该行，下一条记录另起一行"""
+    log_file = knowledge_dir / km._EXPERIENCE_LOG
+    log_file.write_text(json.dumps(_experience(0)) + "\n" + '{"id": "EXP_', encoding="utf-8")
+
+    _reload()
+    assert _ids(km._experiences) == ["EXP_0"]
+
+    km._append_experience(_experience(1))
+    _reload()
+    assert _ids(km._experiences) == ["EXP_0", "EXP_1"]
+
+
+def test_reload_during_compaction_keeps_experiences(knowledge_dir, monkeypatch):
+    """重新加载读取两个文件之间，另一线程新增经验并触发合并：不丢失经验"""
+    monkeypatch.setattr(km, "_COMPACT_EVERY", 2)
+    km._append_experience(_experience(0))
+
+    read_log = km._read_experience_log
+    appenders = []
+
+    def read_log_with_concurrent_append(path):
+        # 已读完 experiences.json，此时另一线程新增经验（达到合并阈值）
+        if not appenders:
+            appender = threading.Thread(target=km._append_experience, args=(_experience(1),))
+            appenders.append(appender)
+            appender.start()
+            appender.join(timeout=0.5)
+        return read_log(path)
+
+    monkeypatch.setattr(km, "_read_experience_log", read_log_with_concurrent_append)
+    km._file_sig.clear()
+    asyncio.run(km.load_knowledge())
+    appenders[0].join()
+    monkeypatch.setattr(km, "_read_experience_log", read_log)
+
+    assert _ids(km._experiences) == ["EXP_0", "EXP_1"]
+    assert _ids(_read_json(knowledge_dir / "experiences.json")) == ["EXP_0", "EXP_1"]
+    _reload()
+    assert _ids(km._experiences) == ["EXP_0", "EXP_1"]
+
+
+def test_unchanged_files_are_not_reloaded(knowledge_dir):
+    km._append_experience(_experience(0))
+    _reload()
+    experiences = km._experiences
+
+    asyncio.run(km.load_knowledge())
+    assert km._experiences is experiences
+
+    os.utime(knowledge_dir / km._EXPERIENCE_LOG, ns=(1, 1))
+    asyncio.run(km.load_knowledge())
+    assert km._experiences is not experiences
+    assert _ids(km._experiences) == ["EXP_0"]
@@ -0,0 +1,121 @@
+"""
+_TextIndex / _top_matches 与逐条扫描结果的一致性测试（含同分条目的顺序）
+
+knowledge_manager 作为 mcp_servers 包的子包运行，缺少该包时跳过。
+"""
+import asyncio
+import json
+import random
+
+import pytest
+
+km = pytest.importorskip("mcp_servers.knowledge_manager")
+
+WORDS = ["root", "ROOT", "shell", "短信", "扣费", "木马", "payload", "Dex", "加载", "İd", "x"]
+QUERIES = WORDS + ["ro", "oo", "t", "", "root sh", "扣", "费 木", "xyz", "i̇", "\x1f", "\x1e"]
+
+
+def _text(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _experiences(rng: random.Random, count: int) -> list[dict]:
+    return [
+        {
+            "id": f"EXP_{i}",
+            "title": _text(rng, 2),
+            "content": _text(rng, 12),
+            "tags": [_text(rng, 1) for _ in range(rng.randint(0, 3))],
+        }
+        for i in range(count)
+    ]
+
+
+def _scan(entries: list[dict], query: str, limit: int) -> list[dict]:
+    """逐条扫描打分并按得分稳定排序（索引引入前的实现）"""
+    results = []
+    for entry in entries:
+        score = 0
+        if query in entry.get("title", "").lower():
+            score += 10
+        if query in entry.get("content", "").lower():
+            score += 5
+        for tag in entry.get("tags", []):
+            if query in tag.lower():
+                score += 3
+        if score > 0:
+            results.append({**entry, "relevance_score": score})
+    results.sort(key=lambda x: x["relevance_score"], reverse=True)
+    return results[:limit]
+
+
+def _search(index, entries: list[dict], query: str, limit: int) -> list[dict]:
+    matches = index.score(query, km._EXPERIENCE_WEIGHTS)
+    return km._top_matches(entries, matches, limit, "relevance_score")
+
+
+@pytest.mark.parametrize("limit", [0, 1, 5, 1000, -2])
+def test_index_matches_scan(limit):
+    rng = random.Random(limit)
+    entries = _experiences(rng, 200)
+    index = km._TextIndex(entries, ("title", "content", "tags"))
+    for query in QUERIES:
+        query = query.lower()
+        assert _search(index, entries, query, limit) == _scan(entries, query, limit), query
+
+
+def test_ties_keep_original_order():
+    entries = [{"id": str(i), "title": "same", "content": "", "tags": []} for i in range(10)]
+    index = km._TextIndex(entries, ("title", "content", "tags"))
+    assert [r["id"] for r in _search(index, entries, "same", 4)] == ["0", "1", "2", "3"]
+
+
+def test_sync_indexes_appended_entries():
+    rng = random.Random(7)
+    entries = _experiences(rng, 50)
+    index = km._TextIndex(entries, ("title", "content", "tags"))
+    _search(index, entries, "root", 10)  # 缓存一次查询结果
+
+    entries.extend(_experiences(rng, 30))
+    index.sync()
+    for query in ("root", "短信", "x"):
+        assert _search(index, entries, query, 100) == _scan(entries, query, 100)
+    assert index.tag_sets == [frozenset(entry["tags"]) for entry in entries]
+
+
+def test_search_knowledge_matches_scan(monkeypatch):
+    """category 过滤后仍按原顺序取前 20 条"""
+    rng = random.Random(3)
+    knowledge = [
+        {
+            "id": f"KB_{i}",
+            "category": rng.choice(["malware", "privacy", "payment"]),
+            "title": _text(rng, 2),
+            "description": _text(rng, 4),
+            "content": _text(rng, 12),
+        }
+        for i in range(120)
+    ]
+    monkeypatch.setattr(km, "_knowledge_base", knowledge)
+    monkeypatch.setattr(km, "_knowledge_index", None)
+
+    for category in ("all", "malware", "payment", "missing"):
+        for query in ("root", "短信", "x", "oo"):
+            expected = []
+            for entry in knowledge:
+                if category != "all" and entry["category"] != category:
+                    continue
+                score = 0
+                if query in entry["title"].lower():
+                    score += 10
+                if query in entry["description"].lower():
+                    score += 5
+                if query in entry["content"].lower():
+                    score += 3
+                if score > 0:
+                    expected.append({**entry, "relevance_score": score})
+            expected.sort(key=lambda x: x["relevance_score"], reverse=True)
+
+            args = {"query": query, "category": category}
+            result = asyncio.run(km._search_knowledge(args))
+            assert json.loads(result[0].text) == expected[:20], (category, query)
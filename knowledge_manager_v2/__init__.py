@@ -7,6 +7,7 @@ Provides knowledge retrieval and storage with KB isolation.
 Uses the official MCP SDK for stdio protocol.
 """
 import asyncio
+import functools
 import json
 import logging
 import os
@@ -17,6 +18,11 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; falls back to the json module
+    orjson = None
+
 # Add project root to path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -64,15 +70,35 @@ def _resolve_kb_id(kb_name: str | None) -> str:
     return kb_name
 
 
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to JSON text (orjson when installed), keeping non-ASCII characters.
+
+    Responses are compact since clients parse them; indent is only used for
+    the small, human-oriented kb_stats output.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools."""
     registry = get_registry()
-    kb_list = [kb.kb_id for kb in registry.list_kbs()]
-    default_kb = registry.default_kb
+    kb_ids = tuple(kb.kb_id for kb in registry.list_kbs())
+    return _build_tools(kb_ids, registry.default_kb)
+
 
+@functools.lru_cache(maxsize=8)
+def _build_tools(kb_ids: tuple[str, ...], default_kb: str) -> list[Tool]:
+    """Build the tool definitions for a set of KBs (cached until the KBs change)."""
     # Create kb_name enum with all KBs
-    kb_enum = kb_list if kb_list else [default_kb]
+    kb_enum = list(kb_ids) if kb_ids else [default_kb]
 
     return [
         # Search experiences in a specific KB
@@ -262,13 +288,13 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         else:
             return [TextContent(
                 type="text",
-                text=json.dumps({"error": f"Unknown tool: {name}"}, ensure_ascii=False)
+                text=_dumps({"error": f"Unknown tool: {name}"})
             )]
     except Exception as e:
         logger.error(f"Tool {name} error: {e}", exc_info=True)
         return [TextContent(
             type="text",
-            text=json.dumps({"error": str(e)}, ensure_ascii=False)
+            text=_dumps({"error": str(e)})
         )]
 
 
@@ -284,12 +310,12 @@ async def _search_experience(args: dict) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=json.dumps({
+        text=_dumps({
             "kb_id": kb_id,
             "query": query,
             "results": results,
             "count": len(results)
-        }, ensure_ascii=False, indent=2)
+        })
     )]
 
 
@@ -310,11 +336,11 @@ async def _save_experience(args: dict) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=json.dumps({
+        text=_dumps({
             "success": True,
             "kb_id": kb_id,
             "experience_id": experience_id
-        }, ensure_ascii=False)
+        })
     )]
 
 
@@ -331,11 +357,11 @@ async def _get_similar_cases(args: dict) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=json.dumps({
+        text=_dumps({
             "kb_id": kb_id,
             "results": results,
             "count": len(results)
-        }, ensure_ascii=False, indent=2)
+        })
     )]
 
 
@@ -351,12 +377,12 @@ async def _search_knowledge(args: dict) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=json.dumps({
+        text=_dumps({
             "kb_id": kb_id,
             "query": query,
             "results": results,
             "count": len(results)
-        }, ensure_ascii=False, indent=2)
+        })
     )]
 
 
@@ -372,11 +398,11 @@ async def _list_experiences(args: dict) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=json.dumps({
+        text=_dumps({
             "kb_id": kb_id,
             "experiences": results,
             "count": len(results)
-        }, ensure_ascii=False, indent=2)
+        })
     )]
 
 
@@ -401,11 +427,11 @@ async def _list_kbs(args: dict) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=json.dumps({
+        text=_dumps({
             "knowledge_bases": kbs,
             "default_kb": registry.default_kb,
             "total_count": len(kbs)
-        }, ensure_ascii=False, indent=2)
+        })
     )]
 
 
@@ -419,7 +445,7 @@ async def _kb_stats(args: dict) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=json.dumps(stats, ensure_ascii=False, indent=2)
+        text=_dumps(stats, indent=True)
     )]
 
 
@@ -432,10 +458,11 @@ async def _search_all_kbs(args: dict) -> list[TextContent]:
     results = manager.search_all_kbs(query, top_k)
 
     # Add KB names to results
+    registry = get_registry()
     formatted = {}
     total_results = 0
     for kb_id, kb_results in results.items():
-        kb_config = get_registry().get_kb(kb_id)
+        kb_config = registry.get_kb(kb_id)
         formatted[kb_id] = {
             "kb_name": kb_config.name if kb_config else kb_id,
             "results": kb_results,
@@ -445,12 +472,12 @@ async def _search_all_kbs(args: dict) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=json.dumps({
+        text=_dumps({
             "query": query,
             "results_by_kb": formatted,
             "total_results": total_results,
             "kbs_searched": len(results)
-        }, ensure_ascii=False, indent=2)
+        })
     )]
 
 
@@ -30,7 +30,44 @@ server = Server("report-generator")
 
 # 全局状态
 _reports_dir: str = None
-_templates: dict = {}
+
+# 默认报告模板（常量，服务启动后不再变化）
+_templates: dict = {
+    "standard": {
+        "name": "标准分析报告",
+        "description": "适用于常规恶意软件分析",
+        "sections": [
+            "基本信息",
+            "分析概要",
+            "权限分析",
+            "网络行为",
+            "隐私合规",
+            "家族识别",
+            "结论与建议",
+        ],
+    },
+    "quick": {
+        "name": "快速扫描报告",
+        "description": "适用于批量快速扫描",
+        "sections": ["基本信息", "风险评级", "主要发现", "处理建议"],
+    },
+    "detailed": {
+        "name": "详细分析报告",
+        "description": "适用于深度分析",
+        "sections": [
+            "执行摘要",
+            "样本基本信息",
+            "静态分析",
+            "动态分析",
+            "网络行为分析",
+            "权限分析",
+            "隐私合规评估",
+            "恶意软件家族识别",
+            "IoC清单",
+            "附录",
+        ],
+    },
+}
 
 
 def get_reports_dir() -> str:
@@ -43,146 +80,102 @@ def get_reports_dir() -> str:
     return _reports_dir
 
 
-def load_templates():
-    """加载报告模板"""
-    global _templates
-
-    template_dir = Path(__file__).parent.parent.parent / "templates"
-    template_dir.mkdir(parents=True, exist_ok=True)
-
-    # 默认模板
-    _templates = {
-        "standard": {
-            "name": "标准分析报告",
-            "description": "适用于常规恶意软件分析",
-            "sections": [
-                "基本信息",
-                "分析概要",
-                "权限分析",
-                "网络行为",
-                "隐私合规",
-                "家族识别",
-                "结论与建议",
-            ],
+# 工具定义（静态，导入时构建一次）
+_TOOLS: list[Tool] = [
+    Tool(
+        name="generate_report",
+        description="Generate a malware analysis report",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "app_name": {"type": "string", "description": "Application name"},
+                "package_name": {"type": "string", "description": "Package name"},
+                "analysis_data": {
+                    "type": "object",
+                    "description": "Analysis results data",
+                },
+                "template": {
+                    "type": "string",
+                    "enum": ["standard", "quick", "detailed"],
+                    "default": "standard",
+                    "description": "Report template",
+                },
+                "output_format": {
+                    "type": "string",
+                    "enum": ["markdown", "json", "html"],
+                    "default": "markdown",
+                    "description": "Output format",
+                },
+                "save": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Save report to file",
+                },
+            },
+            "required": ["app_name", "package_name", "analysis_data"],
         },
-        "quick": {
-            "name": "快速扫描报告",
-            "description": "适用于批量快速扫描",
-            "sections": ["基本信息", "风险评级", "主要发现", "处理建议"],
+    ),
+    Tool(
+        name="list_templates",
+        description="List available report templates",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="get_report",
+        description="Get a previously generated report",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "report_id": {
+                    "type": "string",
+                    "description": "Report ID or filename",
+                }
+            },
+            "required": ["report_id"],
+        },
+    ),
+    Tool(
+        name="list_reports",
+        description="List all generated reports",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "default": 20},
+                "app_name": {"type": "string", "description": "Filter by app name"},
+            },
         },
-        "detailed": {
-            "name": "详细分析报告",
-            "description": "适用于深度分析",
-            "sections": [
-                "执行摘要",
-                "样本基本信息",
-                "静态分析",
-                "动态分析",
-                "网络行为分析",
-                "权限分析",
-                "隐私合规评估",
-                "恶意软件家族识别",
-                "IoC清单",
-                "附录",
-            ],
+    ),
+    Tool(
+        name="export_iocs",
+        description="Export IoCs from analysis data",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "analysis_data": {
+                    "type": "object",
+                    "description": "Analysis results",
+                },
+                "format": {
+                    "type": "string",
+                    "enum": ["json", "csv", "stix", "txt"],
+                    "default": "json",
+                },
+            },
+            "required": ["analysis_data"],
         },
-    }
+    ),
+]
 
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """列出可用工具"""
-    return [
-        Tool(
-            name="generate_report",
-            description="Generate a malware analysis report",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "app_name": {"type": "string", "description": "Application name"},
-                    "package_name": {"type": "string", "description": "Package name"},
-                    "analysis_data": {
-                        "type": "object",
-                        "description": "Analysis results data",
-                    },
-                    "template": {
-                        "type": "string",
-                        "enum": ["standard", "quick", "detailed"],
-                        "default": "standard",
-                        "description": "Report template",
-                    },
-                    "output_format": {
-                        "type": "string",
-                        "enum": ["markdown", "json", "html"],
-                        "default": "markdown",
-                        "description": "Output format",
-                    },
-                    "save": {
-                        "type": "boolean",
-                        "default": true,
-                        "description": "Save report to file",
-                    },
-                },
-                "required": ["app_name", "package_name", "analysis_data"],
-            },
-        ),
-        Tool(
-            name="list_templates",
-            description="List available report templates",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        Tool(
-            name="get_report",
-            description="Get a previously generated report",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "report_id": {
-                        "type": "string",
-                        "description": "Report ID or filename",
-                    }
-                },
-                "required": ["report_id"],
-            },
-        ),
-        Tool(
-            name="list_reports",
-            description="List all generated reports",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "default": 20},
-                    "app_name": {"type": "string", "description": "Filter by app name"},
-                },
-            },
-        ),
-        Tool(
-            name="export_iocs",
-            description="Export IoCs from analysis data",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "analysis_data": {
-                        "type": "object",
-                        "description": "Analysis results",
-                    },
-                    "format": {
-                        "type": "string",
-                        "enum": ["json", "csv", "stix", "txt"],
-                        "default": "json",
-                    },
-                },
-                "required": ["analysis_data"],
-            },
-        ),
-    ]
+    return _TOOLS
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """处理工具调用"""
-    load_templates()
-
     try:
         if name == "generate_report":
             return await _generate_report(arguments)
@@ -341,141 +334,141 @@ def _generate_markdown_report(
     template: str,
 ) -> str:
     """生成Markdown格式报告"""
-    lines = []
-
-    # 标题
-    lines.append(f"# {app_name} 分析报告")
-    lines.append("")
-    lines.append(f"**报告ID**: {report_id}")
-    lines.append(f"**包名**: {package_name}")
-    lines.append(f"**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"**风险评分**: {risk_score}/100")
-    lines.append(f"**风险等级**: {risk_level.upper()}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-
-    # 执行摘要
-    lines.append("## 执行摘要")
-    lines.append("")
-    lines.append(f"对 `{app_name}` ({package_name}) 进行了全面的安全分析。")
+    now = datetime.now()
+    permissions = data.get("permissions", {})
+    network = data.get("network", {})
+    privacy = data.get("privacy", {})
+    family = data.get("family", {})
+    iocs = data.get("iocs", {})
 
     if risk_level == "critical":
-        lines.append("**检测结果：该应用存在严重安全风险，疑似恶意软件。**")
+        verdict = "**检测结果：该应用存在严重安全风险，疑似恶意软件。**"
     elif risk_level == "high":
-        lines.append("**检测结果：该应用存在高危行为，建议谨慎使用。**")
+        verdict = "**检测结果：该应用存在高危行为，建议谨慎使用。**"
     elif risk_level == "medium":
-        lines.append("**检测结果：该应用存在一定风险，需要进一步检查。**")
+        verdict = "**检测结果：该应用存在一定风险，需要进一步检查。**"
     else:
-        lines.append("**检测结果：该应用风险较低，未发现明显恶意行为。**")
-    lines.append("")
+        verdict = "**检测结果：该应用风险较低，未发现明显恶意行为。**"
 
-    # 权限分析
-    lines.append("## 权限分析")
-    lines.append("")
-    permissions = data.get("permissions", {})
-    lines.append(f"- 申请权限总数: {permissions.get('total', 0)}")
-    lines.append(f"- 高风险权限: {len(permissions.get('high_risk', []))}")
-    lines.append(f"- 中风险权限: {len(permissions.get('medium_risk', []))}")
-    lines.append("")
+    # 标题、执行摘要、权限统计
+    parts = [
+        f"""# {app_name} 分析报告
+
+**报告ID**: {report_id}
+**包名**: {package_name}
+**生成时间**: {now.strftime('%Y-%m-%d %H:%M:%S')}
+**风险评分**: {risk_score}/100
+**风险等级**: {risk_level.upper()}
+
+---
+
+## 执行摘要
+
+对 `{app_name}` ({package_name}) 进行了全面的安全分析。
+{verdict}
+
+## 权限分析
+
+- 申请权限总数: {permissions.get('total', 0)}
+- 高风险权限: {len(permissions.get('high_risk', []))}
+- 中风险权限: {len(permissions.get('medium_risk', []))}
+
+"""
+    ]
 
     if permissions.get("high_risk"):
-        lines.append("### 高风险权限")
-        lines.append("")
-        for perm in permissions["high_risk"]:
-            lines.append(f"- `{perm}`")
-        lines.append("")
+        parts.append("### 高风险权限\n\n")
+        parts.extend(f"- `{perm}`\n" for perm in permissions["high_risk"])
+        parts.append("\n")
 
     # 网络行为
-    lines.append("## 网络行为")
-    lines.append("")
-    network = data.get("network", {})
-    lines.append(
-        f"- 可疑连接: {['是' if network.get('suspicious_connections') else '否'][0]}"
-    )
-    lines.append(
-        f"- 后台连接: {['是' if network.get('background_connections') else '否'][0]}"
+    parts.append(
+        f"""## 网络行为
+
+- 可疑连接: {'是' if network.get('suspicious_connections') else '否'}
+- 后台连接: {'是' if network.get('background_connections') else '否'}
+
+"""
     )
-    lines.append("")
 
     if network.get("domains"):
-        lines.append("### 发现的域名")
-        lines.append("")
-        for domain in network["domains"]:
-            lines.append(f"- {domain}")
-        lines.append("")
+        parts.append("### 发现的域名\n\n")
+        parts.extend(f"- {domain}\n" for domain in network["domains"])
+        parts.append("\n")
 
-    # 隐私合规
-    lines.append("## 隐私合规")
-    lines.append("")
-    privacy = data.get("privacy", {})
-    lines.append(f"- 数据收集: {['是' if privacy.get('data_collection') else '否'][0]}")
-    lines.append(
-        f"- 过度权限: {['是' if privacy.get('excessive_permissions') else '否'][0]}"
+    # 隐私合规、家族识别
+    parts.append(
+        f"""## 隐私合规
+
+- 数据收集: {'是' if privacy.get('data_collection') else '否'}
+- 过度权限: {'是' if privacy.get('excessive_permissions') else '否'}
+- 隐私声明: {'有' if privacy.get('privacy_policy') else '无'}
+
+## 家族识别
+
+"""
     )
-    lines.append(f"- 隐私声明: {['有' if privacy.get('privacy_policy') else '无'][0]}")
-    lines.append("")
 
-    # 家族识别
-    lines.append("## 家族识别")
-    lines.append("")
-    family = data.get("family", {})
     if family.get("matched"):
-        lines.append(f"**匹配家族**: {family.get('family_name', 'Unknown')}")
-        lines.append(f"**置信度**: {family.get('confidence', 0)}%")
-        lines.append("")
+        parts.append(
+            f"**匹配家族**: {family.get('family_name', 'Unknown')}\n"
+            f"**置信度**: {family.get('confidence', 0)}%\n\n"
+        )
         if family.get("description"):
-            lines.append(f"家族描述: {family['description']}")
+            parts.append(f"家族描述: {family['description']}\n")
     else:
-        lines.append("未匹配到已知恶意软件家族。")
-    lines.append("")
+        parts.append("未匹配到已知恶意软件家族。\n")
+    parts.append("\n")
 
     # IoC清单
-    lines.append("## IoC 清单")
-    lines.append("")
-    iocs = data.get("iocs", {})
+    parts.append("## IoC 清单\n\n")
     if iocs.get("domains"):
-        lines.append("### 域名")
-        for domain in iocs["domains"]:
-            lines.append(f"- {domain}")
-        lines.append("")
+        parts.append("### 域名\n")
+        parts.extend(f"- {domain}\n" for domain in iocs["domains"])
+        parts.append("\n")
 
     if iocs.get("ips"):
-        lines.append("### IP地址")
-        for ip in iocs["ips"]:
-            lines.append(f"- {ip}")
-        lines.append("")
+        parts.append("### IP地址\n")
+        parts.extend(f"- {ip}\n" for ip in iocs["ips"])
+        parts.append("\n")
 
     # 结论与建议
-    lines.append("## 结论与建议")
-    lines.append("")
-
     if risk_level in ["critical", "high"]:
-        lines.append("### 处理建议")
-        lines.append("")
-        lines.append("1. **立即隔离**: 将该应用移至隔离环境进行进一步分析")
-        lines.append("2. **撤销权限**: 撤销应用已获得的所有敏感权限")
-        lines.append("3. **数据检查**: 检查是否有数据泄露")
-        lines.append("4. **上报**: 向相关安全机构上报该恶意软件")
+        advice = """1. **立即隔离**: 将该应用移至隔离环境进行进一步分析
+2. **撤销权限**: 撤销应用已获得的所有敏感权限
+3. **数据检查**: 检查是否有数据泄露
+4. **上报**: 向相关安全机构上报该恶意软件"""
     elif risk_level == "medium":
-        lines.append("### 处理建议")
-        lines.append("")
-        lines.append("1. **权限审查**: 仔细审查应用权限申请")
-        lines.append("2. **监控使用**: 监控应用的网络和数据访问行为")
-        lines.append("3. **用户告知**: 向用户说明潜在风险")
+        advice = """1. **权限审查**: 仔细审查应用权限申请
+2. **监控使用**: 监控应用的网络和数据访问行为
+3. **用户告知**: 向用户说明潜在风险"""
     else:
-        lines.append("### 处理建议")
-        lines.append("")
-        lines.append("1. **定期复查**: 定期重新评估应用安全性")
-        lines.append("2. **关注更新**: 关注应用更新日志")
-    lines.append("")
+        advice = """1. **定期复查**: 定期重新评估应用安全性
+2. **关注更新**: 关注应用更新日志"""
 
-    lines.append("---")
-    lines.append("")
-    lines.append(f"*本报告由 HarmonyOS Malware Analysis Agent 自动生成*")
-    lines.append(f"*生成时间: {datetime.now().isoformat()}*")
+    parts.append(
+        f"""## 结论与建议
 
-    return "\n".join(lines)
+### 处理建议
+
+{advice}
+
+---
+
+*本报告由 HarmonyOS Malware Analysis Agent 自动生成*
+*生成时间: {now.isoformat()}*"""
+    )
+
+    return "".join(parts)
+
+
+# HTML 报告中各风险等级对应的颜色
+_RISK_COLORS = {
+    "critical": "#dc3545",
+    "high": "#fd7e14",
+    "medium": "#ffc107",
+    "low": "#28a745",
+}
 
 
 def _generate_html_report(
@@ -488,13 +481,7 @@ def _generate_html_report(
     template: str,
 ) -> str:
     """生成HTML格式报告"""
-    risk_colors = {
-        "critical": "#dc3545",
-        "high": "#fd7e14",
-        "medium": "#ffc107",
-        "low": "#28a745",
-    }
-    color = risk_colors.get(risk_level, "#6c757d")
+    color = _RISK_COLORS.get(risk_level, "#6c757d")
 
     html = f"""<!DOCTYPE html>
 <html lang="zh-CN">
@@ -732,7 +719,8 @@ async def _export_iocs(args: dict) -> list[TextContent]:
 
 async def main():
     """启动 report-generator MCP Server"""
-    load_templates()
+    template_dir = Path(__file__).parent.parent.parent / "templates"
+    template_dir.mkdir(parents=True, exist_ok=True)
 
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
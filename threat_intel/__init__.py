@@ -29,6 +29,7 @@ server = Server("threat-intel")
 # 全局状态
 _threat_db: dict = {}
 _ioc_db: dict = {}
+_threat_intel_loaded = False
 
 
 def get_threat_db_path() -> str:
@@ -39,8 +40,11 @@ def get_threat_db_path() -> str:
 
 
 def load_threat_intel():
-    """加载威胁情报数据库"""
-    global _threat_db, _ioc_db
+    """加载威胁情报数据库（进程内只加载一次）"""
+    global _threat_db, _ioc_db, _threat_intel_loaded
+
+    if _threat_intel_loaded:
+        return
 
     db_path = get_threat_db_path()
 
@@ -99,6 +103,8 @@ def load_threat_intel():
     else:
         _ioc_db = _build_ioc_index()
 
+    _threat_intel_loaded = True
+
 
 def _save_families():
     """保存家族数据库"""
@@ -244,8 +250,6 @@ async def list_tools() -> list[Tool]:
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """处理工具调用"""
-    load_threat_intel()
-
     try:
         if name == "query_ioc":
             return await _query_ioc(arguments)